@@ -48,6 +48,11 @@ class WorkingNameInputAgent:
         print(f"💯 [AGENT] WORKING NAME INPUT agent initialized")
         self.build_graph()
 
+    def reset(self):
+        """Clear per-run state so a pooled agent can run a new automation"""
+        self.tools = None
+        self.policy.conversation_history = []
+
     def build_graph(self):
         """Build workflow graph"""
         workflow = StateGraph(OutlookAgentState)
@@ -645,7 +650,7 @@ class WorkingNameInputAgent:
                     pass
                     
             if not state.get("end_time"):
-                state["end_time"] = time.time()
+                state["end_time"] = time.monotonic()
                 
             if state.get("success") and state.get("account_data"):
                 final_content = f"🎉 WORKING NAME INPUT SUCCESS!\n📧 {state['account_data'].email}\n🔒 {state['account_data'].password}"
@@ -672,7 +677,7 @@ class WorkingNameInputAgent:
                     
             state["success"] = False
             if not state.get("end_time"):
-                state["end_time"] = time.time()
+                state["end_time"] = time.monotonic()
                 
             err = state.get("error_message", "Unknown")
             state["messages"].append(AIMessage(content=f"❌ WORKING NAME INPUT failed: {err}"))
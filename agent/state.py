@@ -6,31 +6,17 @@ Fixed all issues: country selection, last name typing, recursion limits
 
 from typing import Dict, Any, List, Optional, Union, TypedDict, Annotated
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, date
+from collections import deque
 import time
-from enum import Enum
 
 from langgraph.graph.message import AnyMessage, add_messages
 from langchain_core.messages import HumanMessage, AIMessage, ToolMessage
 
+from backend.enums import WorkflowStep
 
-class WorkflowStep(Enum):
-    """Workflow steps matching comp.py EXACTLY"""
-    INIT = "init"
-    WELCOME = "welcome"           # step1_welcome() 
-    EMAIL = "email"               # step2_email()
-    PASSWORD = "password"         # step3_password()  
-    DETAILS = "details"           # step4_details_fixed()
-    NAME = "name"                 # step5_name()
-    CAPTCHA = "captcha"           # step6_captcha()
-    AUTH_WAIT = "auth_wait"       # wait_authentication()
-    POST_AUTH = "post_auth"       # step7_post_captcha()
-    VERIFY = "verify"             # Check inbox
-    CLEANUP = "cleanup"
-    ERROR = "error"
 
-
-@dataclass
+@dataclass(slots=True)
 class OutlookAccountData:
     """Account data matching comp.py generation pattern"""
     username: str
@@ -59,7 +45,7 @@ class OutlookAccountData:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolCallRecord:
     tool_name: str
     action: str
@@ -123,6 +109,7 @@ class OutlookAgentState(TypedDict):
     
     # Tool execution tracking
     tool_call_history: List[ToolCallRecord]
+    recent_tool_activity: deque  # Pre-formatted lines for the last RECENT_TOOL_ACTIVITY calls
     consecutive_errors: int
     retry_counts: Dict[str, int]
     
@@ -147,6 +134,16 @@ class OutlookAgentState(TypedDict):
     automation_goal: str
 
 
+# Number of tool calls shown in state summaries
+RECENT_TOOL_ACTIVITY = 5
+
+# English month names, indexed by month - 1 (avoids locale-dependent strftime)
+_MONTHS = (
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December"
+)
+
+
 def create_initial_state(
     process_id: str,
     first_name: str,
@@ -197,6 +194,7 @@ def create_initial_state(
         
         # Tool tracking
         "tool_call_history": [],
+        "recent_tool_activity": deque(maxlen=RECENT_TOOL_ACTIVITY),
         "consecutive_errors": 0,
         "retry_counts": {},
         
@@ -213,7 +211,7 @@ def create_initial_state(
         "llm_analysis": None,
         
         # Timing
-        "start_time": time.time(),
+        "start_time": time.monotonic(),  # Monotonic clock, for duration math only
         "end_time": None,
         "max_tool_calls": 100,  # UPDATED: Increased from 25
         
@@ -225,15 +223,14 @@ def create_initial_state(
 def generate_outlook_account_data(first_name: str, last_name: str, date_of_birth: str) -> OutlookAccountData:
     """Generate account data EXACTLY like comp.py"""
     import random
-    from datetime import datetime as dt
     
     print(f"📧 [ACCOUNT] Generating account data for {first_name} {last_name}")
     
     try:
-        bdt = dt.strptime(date_of_birth, "%Y-%m-%d")
-        birth_day = bdt.day
-        birth_year = bdt.year
-        birth_month = bdt.strftime("%B")
+        bd = date.fromisoformat(date_of_birth)
+        birth_day = bd.day
+        birth_year = bd.year
+        birth_month = _MONTHS[bd.month - 1]
     except ValueError:
         birth_day, birth_month, birth_year = 15, "January", 1995
         
@@ -276,6 +273,13 @@ def add_tool_call_record(
     )
     
     state["tool_call_history"].append(record)
+
+    # Format the summary line once here instead of on every summary request
+    status_icon = "✅" if success else "❌"
+    recent = state.get("recent_tool_activity")
+    if recent is None:
+        recent = state["recent_tool_activity"] = deque(maxlen=RECENT_TOOL_ACTIVITY)
+    recent.append(f"{status_icon} {tool_name}.{action} ({duration_ms}ms)")
     
     # Update retry counts
     retry_key = f"{tool_name}.{action}"
@@ -308,7 +312,7 @@ def set_success(state: OutlookAgentState) -> OutlookAgentState:
     
     state["success"] = True
     state["progress_percentage"] = 100
-    state["end_time"] = time.time()
+    state["end_time"] = time.monotonic()
     return state
 
 
@@ -318,27 +322,30 @@ def get_state_summary(state: OutlookAgentState) -> Dict[str, Any]:
     if state.get("start_time") and state.get("end_time"):
         duration = state["end_time"] - state["start_time"]
     elif state.get("start_time"):
-        duration = time.time() - state["start_time"]
-    
-    # Get recent tool activity
-    recent_tools = []
-    if state.get("tool_call_history"):
-        recent_calls = state["tool_call_history"][-5:]  # Last 5 calls
-        for call in recent_calls:
-            status_icon = "✅" if call.success else "❌"
-            recent_tools.append(
-                f"{status_icon} {call.tool_name}.{call.action} ({call.duration_ms}ms)"
-            )
+        duration = time.monotonic() - state["start_time"]
     
+    current_step = state["current_step"]
     return {
         "process_id": state["process_id"],
         "success": state.get("success", False),
         "progress_percentage": state.get("progress_percentage", 0),
-        "current_step": state["current_step"].value if isinstance(state["current_step"], WorkflowStep) else state["current_step"],
-        "created_account": state["account_data"].email if state.get("account_data") else None,
+        "current_step": current_step.value if isinstance(current_step, WorkflowStep) else current_step,
+        "account_email": state["account_data"].email if state.get("account_data") else None,
         "duration_seconds": round(duration, 1),
         "tool_calls_made": len(state.get("tool_call_history", [])),
         "use_llm": state.get("use_llm", False),
         "error_message": state.get("error_message"),
-        "recent_tool_activity": recent_tools
-    }
\ No newline at end of file
+        "recent_tool_activity": list(state.get("recent_tool_activity", ())),
+        "tool_calls": [record.to_dict() for record in state.get("tool_call_history", ())],
+        "messages": [_message_record(message) for message in state.get("messages", ())],
+    }
+
+
+def _message_record(message: AnyMessage) -> Dict[str, Any]:
+    """Plain-dict form of a LangGraph message for API traces and exports"""
+    content = message.content
+    return {
+        "type": message.type,
+        "content": content if isinstance(content, str) else str(content),
+        "tool_calls": list(getattr(message, "tool_calls", None) or ()),
+    }
@@ -4,25 +4,219 @@ Backend Database - Simple database operations for agentic automation system
 """
 
 from typing import Dict, Any, List, Optional
+from contextlib import contextmanager
+from collections import OrderedDict, deque
+from functools import lru_cache
+import threading
+import queue
 import sqlite3
 import json
 import asyncio
+import time
+import secrets
 from datetime import datetime, timedelta
 import os
 
+# Per-connection pragmas: WAL lets readers run alongside the writer and
+# synchronous=NORMAL drops the extra fsync per commit (safe under WAL).
+# Reads go through a 1 GiB memory map, so hot pages come straight from the
+# OS page cache shared by every connection and worker; cache_size (64 MiB)
+# is a per-connection ceiling that only grows as pages are touched.
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA mmap_size=1073741824",
+)
+
+# Number of idle read-only connections kept open for reuse
+READ_POOL_SIZE = 4
+
+# Process log batching: rows per transaction and how long to wait for more
+LOG_BATCH_SIZE = 500
+LOG_FLUSH_INTERVAL = 0.1
+
+# Bound-parameter limit per statement (raised from 999 in SQLite 3.32)
+MAX_BOUND_VARIABLES = 32766 if sqlite3.sqlite_version_info >= (3, 32, 0) else 999
+
+PROCESS_LOG_COLUMNS = ("process_id", "step", "message", "log_level")
+
+# In-memory tail of recent logs per process, so polls skip SQLite
+RECENT_LOG_BUFFER = 200
+RECENT_LOG_PROCESSES = 256
+
+AUTOMATION_RUN_COLUMNS = (
+    "process_id", "first_name", "last_name", "status", "progress_percentage",
+    "account_email", "duration_seconds", "tool_calls_made", "error_message"
+)
+
+TOOL_CALL_COLUMNS = ("process_id", "tool_name", "action", "success", "duration_ms")
+
+# Prepared-statement cache size per connection. sqlite3 keys the cache on the
+# exact SQL string, so every statement below is a module constant or comes
+# from an lru_cache'd builder that returns the same string for the same shape.
+STATEMENT_CACHE_SIZE = 256
+
+_SQL_INSERT_TOOL_CALL = (
+    f"INSERT INTO tool_calls ({', '.join(TOOL_CALL_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(TOOL_CALL_COLUMNS))})"
+)
+_SQL_TOOL_STATS = (
+    "SELECT tool_name, COUNT(*) AS attempts, SUM(success) AS successes "
+    "FROM tool_calls GROUP BY tool_name ORDER BY attempts DESC"
+)
+_SQL_GET_RUN = "SELECT * FROM automation_runs WHERE process_id = ?"
+_SQL_RECENT_RUNS = "SELECT * FROM automation_runs ORDER BY created_at DESC LIMIT ?"
+_SQL_PROCESS_LOGS = (
+    "SELECT step, message, log_level, timestamp FROM process_logs "
+    "WHERE process_id = ? ORDER BY timestamp DESC, id DESC LIMIT ?"
+)
+
+# Rows pulled per fetchmany() call when streaming query results
+FETCH_BATCH_SIZE = 100
+
+@lru_cache(maxsize=None)
+def _sql_upsert_run(columns: tuple) -> str:
+    updates = ", ".join(f"{c} = excluded.{c}" for c in columns if c != "process_id")
+    return (
+        f"INSERT INTO automation_runs ({', '.join(columns)}) "
+        f"VALUES ({', '.join('?' * len(columns))}) "
+        f"ON CONFLICT(process_id) DO UPDATE SET {updates}"
+    )
+
+@lru_cache(maxsize=64)
+def _sql_insert_logs(row_count: int) -> str:
+    row_placeholder = "(" + ", ".join("?" * len(PROCESS_LOG_COLUMNS)) + ")"
+    return (
+        f"INSERT INTO process_logs ({', '.join(PROCESS_LOG_COLUMNS)}) "
+        f"VALUES {', '.join([row_placeholder] * row_count)}"
+    )
+
 class DatabaseManager:
     """Simple database manager for automation logging."""
 
+    __slots__ = (
+        "database_url", "db_path", "in_memory", "_write_lock", "_conn", "_read_pool",
+        "_log_queue", "_flusher_thread", "_recent_lock", "_recent_logs", "_local_logs"
+    )
+
     def __init__(self, database_url: str = "sqlite:///./automation.db"):
         self.database_url = database_url
         self.db_path = database_url.replace("sqlite:///", "")
+        self.in_memory = self.db_path == ":memory:"
+        # Only the single writer connection is serialized; pooled readers need no lock
+        self._write_lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._read_pool: "queue.Queue[sqlite3.Connection]" = queue.Queue(maxsize=READ_POOL_SIZE)
+        self._recent_lock = threading.Lock()
+        self._recent_logs: "OrderedDict[str, deque]" = OrderedDict()
+        # Processes whose every log went through this manager (see begin_process_logs)
+        self._local_logs: set = set()
         self.init_database()
 
+        # Process logs are queued and written in batches by a background thread
+        self._log_queue: queue.Queue = queue.Queue()
+        self._flusher_thread = threading.Thread(
+            target=self._run_log_flusher, name="db-log-flusher", daemon=True
+        )
+        self._flusher_thread.start()
+
+    def _apply_pragmas(self, conn: sqlite3.Connection):
+        """Apply performance pragmas to a freshly opened connection."""
+        if not self.in_memory:
+            # Only takes effect on a new, empty file; a no-op once tables exist
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            # journal_mode is persisted in the file but is cheap to re-assert
+            conn.execute("PRAGMA journal_mode=WAL")
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+
+    def _connect(self, read_only: bool = False) -> sqlite3.Connection:
+        """Open a new autocommit connection with pragmas applied."""
+        # isolation_level=None stops the driver wrapping statements in implicit
+        # transactions; writes open theirs explicitly in get_connection
+        if read_only:
+            conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True,
+                                   check_same_thread=False, timeout=30, isolation_level=None,
+                                   cached_statements=STATEMENT_CACHE_SIZE)
+            for pragma in CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+        else:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30,
+                                   isolation_level=None, cached_statements=STATEMENT_CACHE_SIZE)
+            self._apply_pragmas(conn)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @contextmanager
+    def get_connection(self):
+        """Yield the shared writer connection inside BEGIN IMMEDIATE ... COMMIT."""
+        with self._write_lock:
+            if self._conn is None:
+                self._conn = self._connect()
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                # BaseException so an abandoned generator (GeneratorExit) can't leave it open
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    @contextmanager
+    def get_read_connection(self):
+        """Yield a pooled read-only connection (the writer for in-memory databases)."""
+        if self.in_memory:
+            # A second connection to :memory: would see an empty database
+            with self.get_connection() as conn:
+                yield conn
+            return
+
+        try:
+            conn = self._read_pool.get_nowait()
+        except queue.Empty:
+            conn = self._connect(read_only=True)
+        try:
+            yield conn
+        finally:
+            try:
+                self._read_pool.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
+    def optimize(self, vacuum_pages: int = 1000):
+        """Refresh planner statistics and reclaim up to vacuum_pages free pages."""
+        with self._write_lock:
+            if self._conn is None:
+                return
+            self._conn.execute("PRAGMA optimize")
+            # execute() steps the pragma only once (one page); executescript runs it to completion
+            self._conn.executescript(f"PRAGMA incremental_vacuum({int(vacuum_pages)});")
+
+    def close(self):
+        """Flush pending logs, then close the writer and all pooled reader connections."""
+        if self._flusher_thread.is_alive():
+            self._log_queue.put(None)
+            self._flusher_thread.join(timeout=5)
+        with self._write_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+        while True:
+            try:
+                self._read_pool.get_nowait().close()
+            except queue.Empty:
+                break
+
     def init_database(self):
         """Initialize database tables."""
-        os.makedirs(os.path.dirname(self.db_path) if os.path.dirname(self.db_path) else ".", exist_ok=True)
+        # exist_ok makes this a no-op for an existing directory; a bare filename needs nothing
+        db_dir = "" if self.in_memory else os.path.dirname(self.db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
 
-        with sqlite3.connect(self.db_path) as conn:
+        with self.get_connection() as conn:
             cursor = conn.cursor()
 
             # Automation runs table
@@ -42,6 +236,18 @@ class DatabaseManager:
                 )
             """)
 
+            # Process logs table
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS process_logs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    process_id TEXT NOT NULL,
+                    step TEXT,
+                    message TEXT NOT NULL,
+                    log_level TEXT NOT NULL DEFAULT 'INFO',
+                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+
             # Tool calls table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS tool_calls (
@@ -55,24 +261,258 @@ class DatabaseManager:
                 )
             """)
 
-            conn.commit()
+            # Indexes for the hot lookups: per-process logs/tool calls newest-first,
+            # and run listings filtered by status or ordered by creation time
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_logs_pid_ts ON process_logs(process_id, timestamp DESC)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_tool_calls_pid ON tool_calls(process_id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_runs_status ON automation_runs(status)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_runs_created ON automation_runs(created_at DESC)")
+
+            # Refresh planner statistics so the indexes are picked up
+            cursor.execute("ANALYZE")
 
         print("✅ [DB] Database initialized")
 
+    # ------------------------------------------------------------------
+    # Automation runs
+    # ------------------------------------------------------------------
+
+    def record_automation_run(self, process_id: str, first_name: str, last_name: str,
+                              status: str, **fields) -> bool:
+        """Insert or update the automation_runs row for a process."""
+        values = {"process_id": process_id, "first_name": first_name,
+                  "last_name": last_name, "status": status}
+        values.update({k: v for k, v in fields.items() if k in AUTOMATION_RUN_COLUMNS})
+        columns = tuple(values)
+
+        try:
+            with self.get_connection() as conn:
+                conn.execute(_sql_upsert_run(columns), [values[c] for c in columns])
+        except Exception as e:
+            print(f"⚠️ [DB] Failed to record automation run {process_id}: {e}")
+            return False
+
+        return True
+
+    def get_tool_call_stats(self) -> Dict[str, tuple]:
+        """Per-tool attempt/success totals as parallel columns, aggregated inside SQLite."""
+        with self.get_read_connection() as conn:
+            rows = conn.execute(_SQL_TOOL_STATS).fetchall()
+        names, attempts, successes = zip(*rows) if rows else ((), (), ())
+        return {"tool_names": names, "attempts": attempts, "successes": successes}
+
+    def get_automation_run(self, process_id: str) -> Optional[Dict[str, Any]]:
+        """Fetch one automation_runs row, or None if the process was never recorded."""
+        with self.get_read_connection() as conn:
+            row = conn.execute(_SQL_GET_RUN, (process_id,)).fetchone()
+        return dict(row) if row else None
+
+    def iter_automation_runs(self, limit: int = 100):
+        """Yield the most recent automation runs as dicts, newest first."""
+        return self._iter_rows(_SQL_RECENT_RUNS, (limit,))
+
+    def get_automation_runs(self, limit: int = 100) -> List[Dict[str, Any]]:
+        return list(self.iter_automation_runs(limit))
+
+    def _iter_rows(self, sql: str, params: tuple):
+        """
+        Stream query results in FETCH_BATCH_SIZE batches as plain dicts.
+        The read connection is held until the generator is exhausted or closed.
+        """
+        with self.get_read_connection() as conn:
+            cursor = conn.execute(sql, params)
+            columns = [col[0] for col in cursor.description]
+            try:
+                while True:
+                    rows = cursor.fetchmany(FETCH_BATCH_SIZE)
+                    if not rows:
+                        break
+                    for row in rows:
+                        yield dict(zip(columns, row))
+            finally:
+                cursor.close()
+
+    # ------------------------------------------------------------------
+    # Tool calls
+    # ------------------------------------------------------------------
+
+    def add_tool_calls(self, rows: List[tuple]) -> int:
+        """Insert many build_tool_call_row() tuples in a single transaction."""
+        if not rows:
+            return 0
+        with self.get_connection() as conn:
+            conn.executemany(_SQL_INSERT_TOOL_CALL, rows)
+        return len(rows)
+
+    # ------------------------------------------------------------------
+    # Process logs
+    # ------------------------------------------------------------------
+
+    def iter_process_logs(self, process_id: str, limit: int = 100):
+        """Yield a process's most recent log rows as dicts, newest first."""
+        return self._iter_rows(_SQL_PROCESS_LOGS, (process_id, limit))
+
+    def get_process_logs(self, process_id: str, limit: int = 100) -> List[Dict[str, Any]]:
+        return list(self.iter_process_logs(process_id, limit))
+
+    def add_process_log(self, process_id: str, message: str, step: Optional[str] = None,
+                        log_level: str = "INFO"):
+        """Queue a process log row; the background flusher writes it."""
+        self._log_queue.put((process_id, step, message, log_level))
+
+        # Same shape as a process_logs row (timestamp matches CURRENT_TIMESTAMP, UTC)
+        entry = {"step": step, "message": message, "log_level": log_level,
+                 "timestamp": time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime())}
+        with self._recent_lock:
+            recent = self._recent_logs.get(process_id)
+            if recent is None:
+                recent = self._new_recent_buffer(process_id)
+            recent.append(entry)
+
+    def begin_process_logs(self, process_id: str):
+        """
+        Mark a process created here, before it logs anything: its buffer then holds
+        its whole history until it wraps, so short reads never need SQLite.
+        """
+        with self._recent_lock:
+            self._new_recent_buffer(process_id)
+            self._local_logs.add(process_id)
+
+    def _new_recent_buffer(self, process_id: str) -> deque:
+        """Start a process's log buffer, evicting the oldest buffer past RECENT_LOG_PROCESSES. Caller holds _recent_lock."""
+        recent = self._recent_logs[process_id] = deque(maxlen=RECENT_LOG_BUFFER)
+        if len(self._recent_logs) > RECENT_LOG_PROCESSES:
+            evicted, _ = self._recent_logs.popitem(last=False)
+            self._local_logs.discard(evicted)
+        return recent
+
+    def iter_recent_process_logs(self, process_id: str, limit: int = 100):
+        """
+        Newest-first logs for a process, served from the in-memory buffer when it
+        holds everything requested; otherwise (older rows, other workers, restarts) from SQLite.
+        """
+        with self._recent_lock:
+            recent = self._recent_logs.get(process_id)
+            # A short buffer is the whole history only for processes created here
+            complete = process_id in self._local_logs and len(recent) < RECENT_LOG_BUFFER
+            if recent is not None and (limit <= len(recent) or complete):
+                entries = list(recent)[::-1][:limit]
+            else:
+                entries = None
+        return iter(entries) if entries is not None else self.iter_process_logs(process_id, limit)
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until every log queued so far has been written."""
+        if not self._flusher_thread.is_alive():
+            return False
+        done = threading.Event()
+        self._log_queue.put(done)
+        return done.wait(timeout)
+
+    def add_process_logs(self, rows: List[tuple]) -> int:
+        """
+        Insert many (process_id, step, message, log_level) rows in one transaction.
+        Rows are packed into multi-row INSERT ... VALUES statements, chunked to
+        stay under SQLite's bound-variable limit. Returns the number of rows written.
+        """
+        if not rows:
+            return 0
+
+        chunk_size = MAX_BOUND_VARIABLES // len(PROCESS_LOG_COLUMNS)
+
+        with self.get_connection() as conn:
+            for start in range(0, len(rows), chunk_size):
+                chunk = rows[start:start + chunk_size]
+                params = [value for row in chunk for value in row]
+                conn.execute(_sql_insert_logs(len(chunk)), params)
+        return len(rows)
+
+    def _write_process_logs(self, rows: List[tuple]):
+        """Write a flusher batch, reporting rather than raising on failure."""
+        try:
+            self.add_process_logs(rows)
+        except Exception as e:
+            print(f"⚠️ [DB] Failed to write {len(rows)} process logs: {e}")
+
+    def _run_log_flusher(self):
+        """Drain the log queue, batching up to LOG_BATCH_SIZE rows or LOG_FLUSH_INTERVAL seconds."""
+        while True:
+            item = self._log_queue.get()
+            rows: List[tuple] = []
+            waiters: List[threading.Event] = []
+            stop = False
+            deadline = time.monotonic() + LOG_FLUSH_INTERVAL
+
+            while True:
+                if item is None:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    rows.append(item)
+
+                if stop or waiters or len(rows) >= LOG_BATCH_SIZE:
+                    break
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._log_queue.get(timeout=remaining) if remaining > 0 else self._log_queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            if stop:
+                # Pick up anything queued behind the stop marker
+                while True:
+                    try:
+                        item = self._log_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if isinstance(item, threading.Event):
+                        waiters.append(item)
+                    elif item is not None:
+                        rows.append(item)
+
+            if rows:
+                self._write_process_logs(rows)
+            for waiter in waiters:
+                waiter.set()
+            if stop:
+                return
+
+def generate_process_id(prefix: str) -> str:
+    """
+    Time-ordered process ID (ULID-style): 48-bit millisecond timestamp + 80 random
+    bits, hex encoded. New rows land at the right edge of the process_id index
+    instead of at random pages, and IDs sort by creation time.
+    """
+    return f"{prefix}_{time.time_ns() // 1_000_000:012x}{secrets.randbits(80):020x}"
+
 # Global database manager
 _db_manager = None
+_db_manager_lock = threading.Lock()
 
 def get_database():
-    """Get database manager instance."""
+    """Get database manager instance (created once, even under concurrent first calls)."""
     global _db_manager
     if _db_manager is None:
-        _db_manager = DatabaseManager()
+        with _db_manager_lock:
+            if _db_manager is None:
+                _db_manager = DatabaseManager()
     return _db_manager
 
-async def log_tool_call(db, process_id: str, tool_call_data: Dict[str, Any]) -> bool:
-    """Log a tool call."""
+def build_tool_call_row(process_id: str, tool_call_data: Dict[str, Any]) -> tuple:
+    """Map a tool call dict onto a TOOL_CALL_COLUMNS row."""
+    return (
+        process_id,
+        tool_call_data.get("tool_name") or "unknown",
+        tool_call_data.get("action") or "unknown",
+        bool(tool_call_data.get("success", False)),
+        int(tool_call_data.get("duration_ms") or 0)
+    )
+
+def log_tool_call(db, process_id: str, tool_call_data: Dict[str, Any]) -> bool:
+    """Log a tool call. Blocking: from async code, call it through run_db."""
     try:
-        return True  # Simplified for now
+        return db.add_tool_calls([build_tool_call_row(process_id, tool_call_data)]) == 1
     except Exception:
         return False
 
@@ -83,9 +523,9 @@ async def log_conversation(db, process_id: str, message_data: Dict[str, Any]) ->
     except Exception:
         return False
 
-async def get_automation_logs(db, process_id: str) -> Dict[str, Any]:
-    """Get automation logs."""
+def get_automation_logs(db, process_id: str) -> Dict[str, Any]:
+    """Get automation logs. Blocking: from async code, call it through run_db."""
     try:
-        return {"process_id": process_id, "logs": []}
+        return {"process_id": process_id, "logs": db.get_process_logs(process_id)}
     except Exception:
         return {"error": "Failed to get logs"}
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Backend Enums - Shared enumerations for the agentic mobile automation system
+Single definition used by the API models, the agent state and the LLM client
+"""
+
+from enum import Enum
+
+class LLMProvider(str, Enum):
+    """Supported LLM providers."""
+    GROQ = "groq"
+    GEMINI = "gemini"
+    OPENAI = "openai"
+    ANTHROPIC = "anthropic"
+
+class AutomationStatus(str, Enum):
+    """Automation execution status."""
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+class WorkflowStep(str, Enum):
+    """Workflow steps matching comp.py EXACTLY"""
+    INIT = "init"
+    WELCOME = "welcome"           # step1_welcome()
+    EMAIL = "email"               # step2_email()
+    PASSWORD = "password"         # step3_password()
+    DETAILS = "details"           # step4_details_fixed()
+    NAME = "name"                 # step5_name()
+    CAPTCHA = "captcha"           # step6_captcha()
+    AUTH_WAIT = "auth_wait"       # wait_authentication()
+    POST_AUTH = "post_auth"       # step7_post_captcha()
+    VERIFY = "verify"             # Check inbox
+    CLEANUP = "cleanup"
+    ERROR = "error"
+
+class MessageType(str, Enum):
+    """Conversation message kinds."""
+    HUMAN = "human"
+    AI = "ai"
+    TOOL = "tool"
+    SYSTEM = "system"
+
+__all__ = ["LLMProvider", "AutomationStatus", "WorkflowStep", "MessageType"]
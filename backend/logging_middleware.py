@@ -1,9 +1,12 @@
 #!/usr/bin/env python3
+import os
 import time
-import uuid
 import logging
-import json
-from typing import Callable, Optional, Dict, Any
+import orjson
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Callable, Optional, Dict, Any, List
 from datetime import datetime
 
 from fastapi import Request, Response
@@ -13,19 +16,27 @@ from starlette.responses import Response as StarletteResponse
 from .settings import get_settings
 from .db import get_database
 
+# Starlette header keys are already lowercase, so these compare directly
+_SENSITIVE_HEADERS = frozenset({"authorization", "cookie", "x-api-key", "x-auth-token"})
+
+# Background threads writing queued log records, started by start_queue_logging
+_queue_listeners: List[QueueListener] = []
+
 class LoggingMiddleware(BaseHTTPMiddleware):
     def __init__(self, app, logger: Optional[logging.Logger] = None):
         super().__init__(app)
         self.logger = logger or logging.getLogger("outlook_agent.middleware")
         self.settings = get_settings()
-        self.db = get_database()
+
+        # With both request and response logging off the middleware is a pass-through
+        self._enabled = self.settings["logging"].log_requests or self.settings["logging"].log_responses
 
         # Configure logger if needed
         if not self.logger.handlers:
             self.setup_logger()
 
     def setup_logger(self):
-        formatter = logging.Formatter(self.settings.logging.format)
+        formatter = logging.Formatter(self.settings["logging"].format)
 
         # Console handler
         console_handler = logging.StreamHandler()
@@ -33,32 +44,35 @@ class LoggingMiddleware(BaseHTTPMiddleware):
         self.logger.addHandler(console_handler)
 
         # File handler if enabled
-        if self.settings.logging.log_to_file:
+        if self.settings["logging"].enable_file_logging:
             try:
                 from logging.handlers import RotatingFileHandler
                 file_handler = RotatingFileHandler(
-                    self.settings.logging.log_file_path,
-                    maxBytes=self.settings.logging.max_file_size,
-                    backupCount=self.settings.logging.backup_count
+                    self.settings["logging"].log_file,
+                    maxBytes=self.settings["logging"].max_file_size,
+                    backupCount=self.settings["logging"].backup_count
                 )
                 file_handler.setFormatter(formatter)
                 self.logger.addHandler(file_handler)
             except Exception as e:
                 self.logger.warning(f"Could not setup file logging: {e}")
 
-        self.logger.setLevel(getattr(logging, self.settings.logging.level.upper()))
+        self.logger.setLevel(getattr(logging, self.settings["logging"].level.upper()))
 
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        # Generate request ID
-        request_id = str(uuid.uuid4())
+        if not self._enabled:
+            return await call_next(request)
+
+        # Generate request ID (128 random bits, same hex form as uuid4().hex without UUID construction)
+        request_id = os.urandom(16).hex()
         request.state.request_id = request_id
 
         # Start timing
-        start_time = time.time()
+        start_time = time.monotonic()
         timestamp = datetime.now()
 
         # Log request
-        if self.settings.logging.log_requests:
+        if self.settings["logging"].log_requests:
             await self.log_request(request, request_id, timestamp)
 
         # Process request
@@ -66,10 +80,10 @@ class LoggingMiddleware(BaseHTTPMiddleware):
             response = await call_next(request)
 
             # Calculate duration
-            duration = time.time() - start_time
+            duration = time.monotonic() - start_time
 
             # Log response
-            if self.settings.logging.log_responses:
+            if self.settings["logging"].log_responses:
                 await self.log_response(request, response, request_id, duration)
 
             # Add request ID to response headers
@@ -78,7 +92,7 @@ class LoggingMiddleware(BaseHTTPMiddleware):
             return response
 
         except Exception as e:
-            duration = time.time() - start_time
+            duration = time.monotonic() - start_time
 
             # Log error
             await self.log_error(request, e, request_id, duration)
@@ -87,6 +101,10 @@ class LoggingMiddleware(BaseHTTPMiddleware):
             raise e
 
     async def log_request(self, request: Request, request_id: str, timestamp: datetime):
+        # Skip all formatting work when the record would be filtered anyway
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+
         try:
             # Get client IP
             client_ip = self.get_client_ip(request)
@@ -96,22 +114,30 @@ class LoggingMiddleware(BaseHTTPMiddleware):
             url = str(request.url)
             path = request.url.path
             query_params = dict(request.query_params)
-            headers = dict(request.headers)
 
-            # Remove sensitive headers
-            headers = self.sanitize_headers(headers)
+            # Copy headers with sensitive values redacted
+            headers = self.sanitize_headers(request.headers)
 
-            # Get request body for POST/PUT requests
+            # Get request body for POST/PUT requests, only when small enough.
+            # Starlette caches the bytes on the request, so the route handler
+            # reuses them instead of reading the stream a second time.
             body = None
             if method in ["POST", "PUT", "PATCH"]:
-                try:
-                    body_bytes = await request.body()
-                    if body_bytes:
-                        body = body_bytes.decode("utf-8")
-                        # Sanitize sensitive data in body
-                        body = self.sanitize_body(body)
-                except Exception:
-                    body = "<could not read body>"
+                content_length = request.headers.get("content-length")
+                size = int(content_length) if content_length and content_length.isdigit() else None
+                if size is None:
+                    body = "<omitted, unknown size>"
+                elif size > self.settings["logging"].max_body_bytes:
+                    body = f"<omitted, {size} bytes>"
+                elif size:
+                    try:
+                        body_bytes = await request.body()
+                        if body_bytes:
+                            body = body_bytes.decode("utf-8")
+                            # Sanitize sensitive data in body
+                            body = self.sanitize_body(body)
+                    except Exception:
+                        body = "<could not read body>"
 
             # Create log entry
             log_data = {
@@ -137,10 +163,20 @@ class LoggingMiddleware(BaseHTTPMiddleware):
         try:
             # Get response details
             status_code = response.status_code
-            headers = dict(response.headers)
 
-            # Remove sensitive headers
-            headers = self.sanitize_headers(headers)
+            # Determine log level based on status code
+            if status_code >= 500:
+                log_level = "error"
+            elif status_code >= 400:
+                log_level = "warning"
+            else:
+                log_level = "info"
+
+            if not self.logger.isEnabledFor(getattr(logging, log_level.upper())):
+                return
+
+            # Copy headers with sensitive values redacted
+            headers = self.sanitize_headers(response.headers)
 
             # Create log entry
             log_data = {
@@ -153,14 +189,6 @@ class LoggingMiddleware(BaseHTTPMiddleware):
                 "method": request.method
             }
 
-            # Determine log level based on status code
-            if status_code >= 500:
-                log_level = "error"
-            elif status_code >= 400:
-                log_level = "warning"
-            else:
-                log_level = "info"
-
             getattr(self.logger, log_level)(
                 f"Response {request_id}: {status_code} in {duration:.3f}s",
                 extra=log_data
@@ -197,43 +225,31 @@ class LoggingMiddleware(BaseHTTPMiddleware):
         # Check for forwarded headers first
         forwarded_for = request.headers.get("X-Forwarded-For")
         if forwarded_for:
-            return forwarded_for.split(",")[0].strip()
+            return forwarded_for.partition(",")[0].strip()
 
         real_ip = request.headers.get("X-Real-IP")
         if real_ip:
             return real_ip
 
         # Fall back to direct client
-        if hasattr(request.client, "host"):
-            return request.client.host
-
-        return "unknown"
-
-    def sanitize_headers(self, headers: Dict[str, Any]) -> Dict[str, Any]:
-        sanitized = {}
-        sensitive_keys = {"authorization", "cookie", "x-api-key", "x-auth-token"}
-
-        for key, value in headers.items():
-            if key.lower() in sensitive_keys:
-                sanitized[key] = "***REDACTED***"
-            else:
-                sanitized[key] = value
+        return getattr(request.client, "host", None) or "unknown"
 
-        return sanitized
+    def sanitize_headers(self, headers) -> Dict[str, Any]:
+        return {k: ("***REDACTED***" if k in _SENSITIVE_HEADERS else v) for k, v in headers.items()}
 
     def sanitize_body(self, body: str) -> str:
         try:
             # Try to parse as JSON and sanitize
-            data = json.loads(body)
+            data = orjson.loads(body)
 
             if isinstance(data, dict):
-                for field in self.settings.logging.sensitive_fields:
+                for field in self.settings["logging"].sensitive_fields:
                     if field in data:
                         data[field] = "***REDACTED***"
 
-                return json.dumps(data)
+                return orjson.dumps(data).decode()
 
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             # Not JSON, return as is (could add more sanitization)
             pass
 
@@ -244,7 +260,7 @@ class ProcessLogger:
         self.process_id = process_id
         self.logger = logger or logging.getLogger("outlook_agent.process")
         self.db = get_database()
-        self.start_time = time.time()
+        self.start_time = time.monotonic()
 
     def log(self, message: str, level: str = "INFO", step: Optional[str] = None, 
            extra: Optional[Dict[str, Any]] = None):
@@ -260,7 +276,7 @@ class ProcessLogger:
         log_data = {
             "process_id": self.process_id,
             "step": step,
-            "duration": round(time.time() - self.start_time, 3)
+            "duration": round(time.monotonic() - self.start_time, 3)
         }
 
         if extra:
@@ -292,36 +308,117 @@ def setup_logging(app):
     settings = get_settings()
 
     if not logger.handlers:
-        formatter = logging.Formatter(settings.logging.format)
+        formatter = logging.Formatter(settings["logging"].format)
 
         # Console handler
         console_handler = logging.StreamHandler()
         console_handler.setFormatter(formatter)
-        logger.addHandler(console_handler)
+        handlers = [console_handler]
 
         # File handler if enabled
-        if settings.logging.log_to_file:
+        if settings["logging"].enable_file_logging:
             try:
                 from logging.handlers import RotatingFileHandler
                 import os
 
                 # Create log directory if needed
-                log_dir = os.path.dirname(settings.logging.log_file_path)
+                log_dir = os.path.dirname(settings["logging"].log_file)
                 os.makedirs(log_dir, exist_ok=True)
 
                 file_handler = RotatingFileHandler(
-                    settings.logging.log_file_path,
-                    maxBytes=settings.logging.max_file_size,
-                    backupCount=settings.logging.backup_count
+                    settings["logging"].log_file,
+                    maxBytes=settings["logging"].max_file_size,
+                    backupCount=settings["logging"].backup_count
                 )
                 file_handler.setFormatter(formatter)
-                logger.addHandler(file_handler)
+                handlers.append(file_handler)
             except Exception as e:
-                logger.warning(f"Could not setup file logging: {e}")
+                print(f"⚠️ [LOGGING] Could not setup file logging: {e}")
+
+        start_queue_logging(logger, *handlers)
 
-        logger.setLevel(getattr(logging, settings.logging.level.upper()))
+        logger.setLevel(getattr(logging, settings["logging"].level.upper()))
 
     return logger
 
+def start_queue_logging(logger: logging.Logger, *handlers: logging.Handler) -> QueueListener:
+    # Callers only enqueue records; handler I/O runs on the listener thread
+    log_queue = queue.Queue(-1)
+    logger.addHandler(QueueHandler(log_queue))
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    _queue_listeners.append(listener)
+    return listener
+
+def stop_logging():
+    # Drain queued records and stop the listener threads
+    while _queue_listeners:
+        _queue_listeners.pop().stop()
+
+# Structured sink write coalescing: flush at this many buffered bytes or after this many seconds
+STRUCTURED_BUFFER_BYTES = 64 * 1024
+STRUCTURED_FLUSH_INTERVAL = 0.1
+
+class StructuredSink:
+    """Append JSON-lines records to a file from a background thread, coalescing writes."""
+
+    def __init__(self, path: str, max_pending: int = 4096):
+        self.path = path
+        self.dropped = 0
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(maxsize=max_pending)
+        self._thread = threading.Thread(target=self._run, name="structured-log", daemon=True)
+        self._thread.start()
+
+    def emit(self, record: Dict[str, Any]) -> bool:
+        """Queue a record without blocking; it is dropped and counted when the queue is full."""
+        try:
+            self._queue.put_nowait(record)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def close(self, timeout: float = 5.0):
+        """Write everything queued so far and stop the writer thread."""
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+
+    def _run(self):
+        log_dir = os.path.dirname(self.path)
+        if log_dir:
+            os.makedirs(log_dir, exist_ok=True)
+
+        buffer = bytearray()
+        deadline = 0.0
+        with open(self.path, "ab", buffering=0) as f:
+            while True:
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.monotonic(), 0) if buffer else None)
+                except queue.Empty:
+                    item = ...  # Flush interval elapsed
+
+                stop = item is None
+                if isinstance(item, dict):
+                    if not buffer:
+                        deadline = time.monotonic() + STRUCTURED_FLUSH_INTERVAL
+                    try:
+                        buffer += orjson.dumps(item, default=str)
+                        buffer += b"\n"
+                    except TypeError:
+                        self.dropped += 1
+
+                if buffer and (stop or len(buffer) >= STRUCTURED_BUFFER_BYTES
+                               or time.monotonic() >= deadline):
+                    try:
+                        f.write(buffer)
+                    except OSError as e:
+                        print(f"⚠️ [LOGGING] Structured log write failed: {e}")
+                    buffer.clear()
+                if stop:
+                    break
+
 def get_process_logger(process_id: str) -> ProcessLogger:
     return ProcessLogger(process_id)
@@ -6,19 +6,26 @@ Provides REST API for automation management, tool call tracing, and conversation
 
 from fastapi import FastAPI, HTTPException, BackgroundTasks, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse, Response
 from pydantic import BaseModel, Field
 from typing import Dict, Any, List, Optional
-import uuid
+from collections import OrderedDict, Counter, deque
+from itertools import islice
+from functools import wraps, partial
+from concurrent.futures import ThreadPoolExecutor
 import asyncio
 from datetime import datetime, timedelta
 import logging
-import json
+import sys
 import os
+import time
+import orjson
 
 from .settings import get_settings, print_settings_summary
-from .models import AutomationRequest, AutomationResponse, ToolCallLog, ConversationLog
-from .db import get_database, log_tool_call, log_conversation, get_automation_logs
+from .models import AutomationRequest, AutomationResponse, AutomationStatistics, ToolCallLog, ConversationLog, validate, dump_json
+from .db import get_database, generate_process_id, build_tool_call_row, log_conversation, get_automation_logs
+from .logging_middleware import start_queue_logging, stop_logging, StructuredSink
+from .enums import AutomationStatus, WorkflowStep
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -26,7 +33,8 @@ app = FastAPI(
     description="REST API for agentic mobile automation with OCR and LLM orchestration",
     version="2.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse
 )
 
 # Global settings
@@ -41,8 +49,150 @@ app.add_middleware(
     allow_headers=settings["api"].allow_headers,
 )
 
-# Global state for active automations
-active_automations: Dict[str, Dict[str, Any]] = {}
+# Background workflow output goes through a queue so stdout writes never block the event loop
+workflow_logger = logging.getLogger("outlook_agent.workflow")
+
+# Idle agents by (use_llm, provider); each agent runs one automation at a time
+agent_pool: Dict[tuple, List[Any]] = {}
+
+def acquire_agent(use_llm: bool, provider: str):
+    """Take an idle agent from the pool, or build one (graph, policy, LLM client) if none is free."""
+    idle = agent_pool.get((use_llm, provider))
+    if idle:
+        agent = idle.pop()
+        agent.reset()
+        return agent
+
+    from agent.graph import create_agentic_outlook_agent
+    return create_agentic_outlook_agent(use_llm=use_llm, provider=provider)
+
+def release_agent(agent):
+    """Return an agent to the pool, up to settings.agent.agent_pool_size idle per key."""
+    idle = agent_pool.setdefault((agent.use_llm, agent.provider), [])
+    if len(idle) < settings["agent"].agent_pool_size:
+        idle.append(agent)
+
+# Global state for active automations, oldest first
+active_automations: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+# Number of tracked automations per status, kept in step by set_status
+status_counts: Counter = Counter()
+
+def set_status(automation: Dict[str, Any], new_status: str):
+    """Change an automation's status, updating status_counts while it is still tracked."""
+    if active_automations.get(automation["process_id"]) is automation:
+        status_counts[automation["status"]] -= 1
+        status_counts[new_status] += 1
+    automation["status"] = new_status
+
+# (second, ISO string) of the last now_iso_cached() call; replaced as one tuple so readers never see a torn pair
+_iso_clock = (-1, "")
+
+def now_iso_cached() -> str:
+    """Current local time as an ISO string, re-formatted at most once per second."""
+    global _iso_clock
+    second = int(time.time())
+    cached_second, value = _iso_clock
+    if second != cached_second:
+        value = datetime.fromtimestamp(second).isoformat()
+        _iso_clock = (second, value)
+    return value
+
+def truncate_preview(text: str, limit: int) -> str:
+    return text[:limit] + "..." if len(text) > limit else text
+
+def append_message(automation: Dict[str, Any], message: Dict[str, Any]):
+    """Append a conversation message and its fixed-shape /trace record."""
+    automation["messages"].append(message)
+    automation["history_versions"]["conversation"] += 1
+    automation["trace_messages"].append({
+        "timestamp": message.get("timestamp", "unknown"),
+        "type": message.get("type", "unknown"),
+        "content": truncate_preview(message.get("content", ""), 200),
+        "tool_calls": message.get("tool_calls", [])
+    })
+
+# JSON-lines tool call log (settings.logging.structured_log_file), opened on startup
+tool_call_sink: Optional[StructuredSink] = None
+
+def append_tool_call(automation: Dict[str, Any], call: Dict[str, Any]):
+    """Append a tool call and its /trace record, updating the summary counters."""
+    automation["tool_calls"].append(call)
+    automation["history_versions"]["tool_calls"] += 1
+    if tool_call_sink is not None:
+        tool_call_sink.emit({"process_id": automation["process_id"], **call})
+    automation["trace_tool_calls"].append({
+        "timestamp": call.get("timestamp"),
+        "tool_name": call.get("tool_name"),
+        "action": call.get("action"),
+        "parameters": call.get("parameters", {}),
+        "success": call.get("success", False),
+        "duration_ms": call.get("duration_ms", 0),
+        "result_summary": truncate_preview(str(call.get("result", {})), 100)
+    })
+    if call.get("success", False):
+        automation["successful_tool_calls"] += 1
+    else:
+        automation["failed_tool_calls"] += 1
+    automation["tools_used"].add(call.get("tool_name"))
+
+def register_automation(process_id: str, automation_state: Dict[str, Any]):
+    """Track a new automation, evicting the oldest finished runs past settings.api.max_active."""
+    active_automations[process_id] = automation_state
+    status_counts[automation_state["status"]] += 1
+
+    excess = len(active_automations) - settings["api"].max_active
+    if excess <= 0:
+        return
+
+    # Only runs whose workflow has returned are evicted; those are recorded in the database.
+    # A cancelled run keeps executing until the agent returns, so it stays tracked until then.
+    for old_id in list(active_automations):
+        if excess <= 0:
+            break
+        if old_id != process_id and active_automations[old_id]["finished"]:
+            status_counts[active_automations.pop(old_id)["status"]] -= 1
+            excess -= 1
+
+def model_response(model: BaseModel) -> Response:
+    """Serialize a response model with pydantic's Rust encoder, bypassing jsonable_encoder."""
+    return Response(content=dump_json(model), media_type="application/json")
+
+# SQLite calls are blocking, so handlers run them here instead of on the event loop
+db_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="db")
+
+async def run_db(func, *args, **kwargs):
+    """Run a blocking DatabaseManager call on db_executor."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(db_executor, partial(func, *args, **kwargs))
+
+# Short-lived cache of encoded JSON bodies for hot read-only endpoints
+RESPONSE_CACHE_SIZE = 256
+response_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+
+def cached_response(ttl: float):
+    """Cache an endpoint's JSON body for ttl seconds, keyed on its path and query parameters."""
+    def decorator(handler):
+        @wraps(handler)
+        async def wrapper(**kwargs):
+            key = (handler.__name__, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+
+            entry = response_cache.get(key)
+            if entry is not None and entry[0] > now:
+                return Response(content=entry[1], media_type="application/json")
+
+            result = await handler(**kwargs)
+            body = result.body if isinstance(result, Response) else orjson.dumps(result)
+
+            response_cache[key] = (now + ttl, body)
+            response_cache.move_to_end(key)
+            if len(response_cache) > RESPONSE_CACHE_SIZE:
+                response_cache.popitem(last=False)
+
+            return Response(content=body, media_type="application/json")
+        return wrapper
+    return decorator
 
 @app.on_event("startup")
 async def startup_event():
@@ -50,6 +200,18 @@ async def startup_event():
     print("🚀 [API] Starting Agentic Mobile Automation API...")
     print_settings_summary()
 
+    # Workflow messages keep the plain emoji console format
+    if not workflow_logger.handlers:
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setFormatter(logging.Formatter("%(message)s"))
+        start_queue_logging(workflow_logger, console_handler)
+        workflow_logger.setLevel(logging.INFO)
+        workflow_logger.propagate = False
+
+    global tool_call_sink
+    if settings["logging"].enable_structured_logging and tool_call_sink is None:
+        tool_call_sink = StructuredSink(settings["logging"].structured_log_file)
+
     # Initialize database
     try:
         db = get_database()
@@ -68,6 +230,22 @@ async def shutdown_event():
     for process_id in list(active_automations.keys()):
         active_automations[process_id]["cancelled"] = True
 
+    # Tidy the database file, then release connections
+    try:
+        db = get_database()
+        db.optimize()
+        db.close()
+    except Exception as e:
+        print(f"⚠️ [API] Database close failed: {e}")
+    db_executor.shutdown(wait=False)
+
+    # Flush queued application and structured tool call log records
+    stop_logging()
+    global tool_call_sink
+    if tool_call_sink is not None:
+        tool_call_sink.close()
+        tool_call_sink = None
+
     print("✅ [API] API server shutdown complete")
 
 # ============================================================================
@@ -82,7 +260,7 @@ async def start_automation(
 ):
     """Start agentic automation workflow."""
 
-    process_id = f"outlook_{uuid.uuid4().hex[:8]}"
+    process_id = generate_process_id("outlook")
 
     print(f"🚀 [API] Starting automation {process_id}")
     print(f"👤 [API] User: {request.first_name} {request.last_name}")
@@ -90,21 +268,44 @@ async def start_automation(
 
     try:
         # Initialize automation state
+        created_at = datetime.now()
         automation_state = {
             "process_id": process_id,
             "status": "running",
-            "created_at": datetime.now(),
+            "created_at": created_at,
+            "created_at_iso": created_at.isoformat(),
             "progress": 0,
-            "current_step": "initializing",
+            "current_step": WorkflowStep.INIT.value,
             "use_llm": request.use_llm,
             "llm_provider": request.llm_provider,
             "cancelled": False,
-            "tool_calls": [],
-            "messages": [],
+            "finished": False,
+            "tool_calls": deque(maxlen=settings["agent"].max_tool_calls_in_memory),
+            "trace_tool_calls": deque(maxlen=settings["agent"].max_tool_calls_in_memory),
+            "successful_tool_calls": 0,
+            "failed_tool_calls": 0,
+            "tools_used": set(),
+            "messages": deque(maxlen=settings["agent"].max_messages_in_memory),
+            "trace_messages": deque(maxlen=settings["agent"].max_messages_in_memory),
+            # Bumped on every append (never reset), so cached export sections know when they are stale
+            "history_versions": {"conversation": 0, "tool_calls": 0},
             "error_message": None
         }
 
-        active_automations[process_id] = automation_state
+        # Build the response before recording anything, so a bad response leaves no orphaned run
+        response = validate(AutomationResponse, dict(
+            process_id=process_id,
+            status=AutomationStatus.RUNNING,
+            message="Agentic automation workflow initiated",
+            progress_percentage=0,
+            current_step=WorkflowStep.INIT
+        ))
+
+        register_automation(process_id, automation_state)
+        db.begin_process_logs(process_id)
+
+        # Shared record so other workers (and this one, after eviction) can answer status
+        await run_db(db.record_automation_run, process_id, request.first_name, request.last_name, "running")
 
         # Start automation in background
         background_tasks.add_task(
@@ -114,16 +315,8 @@ async def start_automation(
             db
         )
 
-        response = AutomationResponse(
-            process_id=process_id,
-            status="started",
-            message="Agentic automation workflow initiated",
-            progress_percentage=0,
-            current_step="initializing"
-        )
-
         print(f"✅ [API] Automation {process_id} started successfully")
-        return response
+        return model_response(response)
 
     except Exception as e:
         error_msg = f"Failed to start automation: {e}"
@@ -132,34 +325,37 @@ async def start_automation(
         raise HTTPException(status_code=500, detail=error_msg)
 
 @app.get("/api/v2/automation/{process_id}/status", response_model=AutomationResponse)
-async def get_automation_status(process_id: str):
+async def get_automation_status(process_id: str, db = Depends(get_database)):
     """Get current automation status with tool call summary."""
 
     if process_id not in active_automations:
-        raise HTTPException(status_code=404, detail=f"Automation {process_id} not found")
+        # Started by another worker or evicted from memory: answer from the database
+        run = await run_db(db.get_automation_run, process_id)
+        if run is None:
+            raise HTTPException(status_code=404, detail=f"Automation {process_id} not found")
+
+        return model_response(AutomationResponse.from_db_row(run))
 
     automation = active_automations[process_id]
 
-    # Count successful/failed tool calls
-    tool_calls = automation.get("tool_calls", [])
-    successful_tools = sum(1 for call in tool_calls if call.get("success", False))
-    failed_tools = len(tool_calls) - successful_tools
+    successful_tools = automation.get("successful_tool_calls", 0)
+    failed_tools = automation.get("failed_tool_calls", 0)
 
-    response = AutomationResponse(
+    response = validate(AutomationResponse, dict(
         process_id=process_id,
         status=automation["status"],
         message=automation.get("error_message") or f"Automation {automation['status']}",
         progress_percentage=automation.get("progress", 0),
-        current_step=automation.get("current_step", "unknown"),
+        current_step=automation.get("current_step"),
         account_email=automation.get("account_email"),
         duration_seconds=automation.get("duration_seconds"),
-        tool_calls_made=len(tool_calls),
+        tool_calls_made=successful_tools + failed_tools,
         successful_tool_calls=successful_tools,
         failed_tool_calls=failed_tools,
         use_llm=automation["use_llm"]
-    )
+    ))
 
-    return response
+    return model_response(response)
 
 @app.post("/api/v2/automation/{process_id}/cancel")
 async def cancel_automation(process_id: str):
@@ -171,14 +367,14 @@ async def cancel_automation(process_id: str):
     automation = active_automations[process_id]
 
     if automation["status"] in ["completed", "failed", "cancelled"]:
-        return JSONResponse(content={"message": f"Automation already {automation['status']}"})
+        return ORJSONResponse(content={"message": f"Automation already {automation['status']}"})
 
     automation["cancelled"] = True
-    automation["status"] = "cancelled"
+    set_status(automation, "cancelled")
 
     print(f"⚠️ [API] Automation {process_id} cancelled by request")
 
-    return JSONResponse(content={"message": "Automation cancellation requested"})
+    return ORJSONResponse(content={"message": "Automation cancellation requested"})
 
 # ============================================================================
 # TOOL CALL TRACING ENDPOINTS
@@ -195,73 +391,67 @@ async def get_tool_calls(process_id: str, limit: int = 50):
     tool_calls = automation.get("tool_calls", [])
 
     # Return most recent tool calls
-    recent_calls = tool_calls[-limit:] if len(tool_calls) > limit else tool_calls
+    recent_calls = list(islice(tool_calls, max(len(tool_calls) - limit, 0), None))
 
     return {
         "process_id": process_id,
-        "total_tool_calls": len(tool_calls),
+        "total_tool_calls": automation.get("successful_tool_calls", 0) + automation.get("failed_tool_calls", 0),
         "returned_calls": len(recent_calls),
         "tool_calls": recent_calls
     }
 
 @app.get("/api/v2/automation/{process_id}/trace")
-async def get_automation_trace(process_id: str):
-    """Get complete automation trace including messages and tool calls."""
+@cached_response(ttl=1.0)
+async def get_automation_trace(process_id: str, offset: int = 0, limit: Optional[int] = None):
+    """Get automation trace including messages and tool calls (paged with offset/limit)."""
 
     if process_id not in active_automations:
         raise HTTPException(status_code=404, detail=f"Automation {process_id} not found")
 
     automation = active_automations[process_id]
 
-    # Generate trace summary
-    tool_calls = automation.get("tool_calls", [])
-    messages = automation.get("messages", [])
+    # Trace records were built with a fixed shape when stored; only page them here
+    messages = automation["trace_messages"]
+    end = offset + limit if limit is not None else None
 
     trace_data = {
         "process_id": process_id,
         "status": automation["status"],
-        "created_at": automation["created_at"].isoformat(),
+        "created_at": automation["created_at_iso"],
         "progress": automation.get("progress", 0),
         "current_step": automation.get("current_step"),
         "use_llm": automation["use_llm"],
         "llm_provider": automation.get("llm_provider"),
 
         # Conversation trace
-        "messages": [
-            {
-                "timestamp": msg.get("timestamp", "unknown"),
-                "type": msg.get("type", "unknown"),
-                "content": msg.get("content", "")[:200] + "..." if len(msg.get("content", "")) > 200 else msg.get("content", ""),
-                "tool_calls": msg.get("tool_calls", [])
-            }
-            for msg in messages
-        ],
+        "messages": list(islice(messages, offset, end)),
 
         # Tool execution trace
-        "tool_calls": [
-            {
-                "timestamp": call.get("timestamp"),
-                "tool_name": call.get("tool_name"),
-                "action": call.get("action"),
-                "parameters": call.get("parameters", {}),
-                "success": call.get("success", False),
-                "duration_ms": call.get("duration_ms", 0),
-                "result_summary": str(call.get("result", {}))[:100] + "..." if len(str(call.get("result", {}))) > 100 else str(call.get("result", {}))
-            }
-            for call in tool_calls
-        ],
+        "tool_calls": list(islice(automation["trace_tool_calls"], offset, end)),
 
         # Summary statistics
         "summary": {
             "total_messages": len(messages),
-            "total_tool_calls": len(tool_calls),
-            "successful_tool_calls": sum(1 for call in tool_calls if call.get("success", False)),
-            "unique_tools_used": len(set(call.get("tool_name") for call in tool_calls)),
+            "total_tool_calls": automation.get("successful_tool_calls", 0) + automation.get("failed_tool_calls", 0),
+            "successful_tool_calls": automation.get("successful_tool_calls", 0),
+            "unique_tools_used": len(automation.get("tools_used", ())),
             "duration_seconds": automation.get("duration_seconds")
         }
     }
 
-    return trace_data
+    # Returned directly so FastAPI skips its jsonable_encoder pass over the trace
+    return ORJSONResponse(trace_data)
+
+@app.get("/api/v2/automation/{process_id}/logs")
+async def stream_process_logs(process_id: str, limit: int = 100, db = Depends(get_database)):
+    """Stream stored process logs as newline-delimited JSON, newest first."""
+
+    rows = db.iter_recent_process_logs(process_id, limit)
+
+    return StreamingResponse(
+        (orjson.dumps(row) + b"\n" for row in rows),
+        media_type="application/x-ndjson"
+    )
 
 @app.get("/api/v2/automation/{process_id}/export")
 async def export_automation_data(process_id: str, format: str = "json"):
@@ -275,9 +465,9 @@ async def export_automation_data(process_id: str, format: str = "json"):
     export_data = {
         "metadata": {
             "process_id": process_id,
-            "exported_at": datetime.now().isoformat(),
+            "exported_at": now_iso_cached(),
             "status": automation["status"],
-            "created_at": automation["created_at"].isoformat(),
+            "created_at": automation["created_at_iso"],
             "use_llm": automation["use_llm"],
             "llm_provider": automation.get("llm_provider")
         },
@@ -293,43 +483,76 @@ async def export_automation_data(process_id: str, format: str = "json"):
     }
 
     if format == "json":
-        # Save to temporary file
         filename = f"automation_export_{process_id}.json"
-        filepath = f"/tmp/{filename}"
-
-        with open(filepath, "w") as f:
-            json.dump(export_data, f, indent=2, default=str)
 
-        return FileResponse(
-            filepath,
+        return StreamingResponse(
+            iter_export_json(export_data, automation["history_versions"], automation.setdefault("export_cache", {})),
             media_type="application/json",
-            filename=filename
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'}
         )
 
+    elif format == "columnar":
+        # Column-per-field histories for analytics loads
+        export_data["conversation"] = to_columns(export_data["conversation"])
+        export_data["tool_calls"] = to_columns(export_data["tool_calls"])
+        return ORJSONResponse(export_data)
+
     else:
+        # orjson has no deque support; the histories are bounded, so copy them
+        export_data["conversation"] = list(export_data["conversation"])
+        export_data["tool_calls"] = list(export_data["tool_calls"])
         return export_data
 
+EXPORT_JSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+def encode_export(value) -> bytes:
+    """Encode one export value, stringifying anything orjson cannot serialize."""
+    return orjson.dumps(value, option=EXPORT_JSON_OPTIONS, default=str)
+
+def encode_export_section(records, version: int, cache: Dict[str, Any], section: str) -> bytes:
+    """JSON array of history records, reused until the section's history version changes."""
+    cached = cache.get(section)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    body = b"[" + b",".join(map(encode_export, records)) + b"]"
+    cache[section] = (version, body)
+    return body
+
+def to_columns(records) -> Dict[str, List[Any]]:
+    """Reshape history records into one list per field (missing fields are None)."""
+    fields: Dict[str, None] = {}
+    for record in records:
+        fields.update(dict.fromkeys(record))
+    return {field: [record.get(field) for record in records] for field in fields}
+
+async def iter_export_json(export_data: Dict[str, Any], versions: Dict[str, int], cache: Dict[str, Any]):
+    """Encode an export section by section, reusing pre-serialized history arrays."""
+    yield b'{"metadata":' + encode_export(export_data["metadata"])
+
+    for section in ("conversation", "tool_calls"):
+        yield f',"{section}":'.encode() + encode_export_section(export_data[section], versions[section], cache, section)
+
+    yield b',"final_state":' + encode_export(export_data["final_state"]) + b"}"
+
 # ============================================================================
 # SYSTEM STATUS ENDPOINTS
 # ============================================================================
 
 @app.get("/api/v2/system/status")
+@cached_response(ttl=2.0)
 async def get_system_status():
     """Get system status and health."""
 
-    active_count = len([a for a in active_automations.values() if a["status"] == "running"])
-    completed_count = len([a for a in active_automations.values() if a["status"] == "completed"])
-    failed_count = len([a for a in active_automations.values() if a["status"] == "failed"])
-
     return {
         "status": "healthy",
         "version": "2.0.0",
         "system_type": "agentic_mobile_automation",
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": now_iso_cached(),
         "automation_stats": {
-            "active_automations": active_count,
-            "completed_automations": completed_count,
-            "failed_automations": failed_count,
+            "active_automations": status_counts["running"],
+            "completed_automations": status_counts["completed"],
+            "failed_automations": status_counts["failed"],
             "total_automations": len(active_automations)
         },
         "capabilities": {
@@ -342,32 +565,62 @@ async def get_system_status():
         "settings": {
             "max_tool_calls": settings["agent"].max_tool_calls,
             "default_llm_provider": settings["llm"].default_provider,
+            "llm_providers": settings["llm"].get_llm_providers_config(),
             "ocr_engine": settings["ocr"].default_engine,
             "tool_logging_enabled": settings["agent"].enable_tool_logging
         }
     }
 
+def tail_lines(path: str, n: int, block_size: int = 8192) -> List[str]:
+    """Return the last n lines of a file, reading backwards from the end in blocks."""
+    if n <= 0:
+        return []
+
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        data = b""
+
+        # n + 1 newlines guarantees the first of the n lines is complete
+        while position > 0 and data.count(b"\n") <= n:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            data = f.read(read_size) + data
+
+    return data.decode("utf-8", errors="replace").splitlines()[-n:]
+
+@app.get("/api/v2/system/tool-stats")
+@cached_response(ttl=2.0)
+async def get_tool_stats():
+    """Get per-tool call counts and success rates across all recorded automations."""
+
+    db = get_database()
+    columns = await run_db(db.get_tool_call_stats)
+    return {
+        **columns,
+        "success_rates": AutomationStatistics.success_rates_from_arrays(
+            columns["tool_names"], columns["attempts"], columns["successes"]
+        )
+    }
+
 @app.get("/api/v2/system/logs")
 async def get_system_logs(lines: int = 100):
     """Get recent system logs."""
 
     log_file = settings["logging"].log_file
 
-    if not os.path.exists(log_file):
-        return {"logs": [], "message": "Log file not found"}
-
+    # open() reports a missing file itself, so no separate exists() stat
     try:
-        with open(log_file, "r") as f:
-            all_lines = f.readlines()
-
-        recent_lines = all_lines[-lines:] if len(all_lines) > lines else all_lines
+        recent_lines = tail_lines(log_file, lines)
 
         return {
-            "total_lines": len(all_lines),
             "returned_lines": len(recent_lines),
             "logs": [line.strip() for line in recent_lines]
         }
 
+    except FileNotFoundError:
+        return {"logs": [], "message": "Log file not found"}
     except Exception as e:
         return {"error": f"Failed to read logs: {e}"}
 
@@ -379,58 +632,78 @@ async def run_automation_workflow(process_id: str, request: AutomationRequest, d
     """Run the complete automation workflow in background."""
 
     automation = active_automations[process_id]
+    agent = None
 
     try:
-        print(f"🔄 [WORKFLOW] Starting background automation for {process_id}")
-
-        # Import and create agentic agent
-        from agent.graph import create_agentic_outlook_agent
+        workflow_logger.info(f"🔄 [WORKFLOW] Starting background automation for {process_id}")
 
-        agent = create_agentic_outlook_agent(
-            use_llm=request.use_llm,
-            provider=request.llm_provider
-        )
+        # Reuse a pooled agent when one is idle
+        agent = acquire_agent(request.use_llm, request.llm_provider)
 
-        automation["status"] = "running"
-        automation["current_step"] = "agent_initialized"
+        set_status(automation, "running")
 
         # Run the automation
         result = agent.run(
             process_id=process_id,
             first_name=request.first_name,
             last_name=request.last_name,
-            date_of_birth=request.date_of_birth,
+            date_of_birth=request.date_of_birth.isoformat(),
             curp_id=request.curp_id
         )
 
         # Update automation state with results
-        automation["status"] = "completed" if result.get("success", False) else "failed"
+        set_status(automation, "completed" if result.get("success", False) else "failed")
         automation["progress"] = result.get("progress_percentage", 0)
-        automation["current_step"] = result.get("current_step", "unknown")
+        automation["current_step"] = result.get("current_step")
         automation["account_email"] = result.get("account_email")
         automation["duration_seconds"] = result.get("duration_seconds")
-        automation["tool_calls"] = result.get("recent_tool_calls", [])
         automation["error_message"] = result.get("error_message")
 
+        # Rebuild the history through append_tool_call so the counters stay in step
+        automation["tool_calls"] = deque(maxlen=settings["agent"].max_tool_calls_in_memory)
+        automation["trace_tool_calls"] = deque(maxlen=settings["agent"].max_tool_calls_in_memory)
+        automation["successful_tool_calls"] = 0
+        automation["failed_tool_calls"] = 0
+        automation["tools_used"] = set()
+        for call in result.get("tool_calls", []):
+            append_tool_call(automation, call)
+        for message in result.get("messages", []):
+            append_message(automation, message)
+
+        # Persist the run so it outlives eviction from active_automations
+        await run_db(
+            db.record_automation_run,
+            process_id, request.first_name, request.last_name, automation["status"],
+            progress_percentage=automation["progress"],
+            account_email=automation["account_email"],
+            duration_seconds=automation["duration_seconds"],
+            tool_calls_made=result.get("tool_calls_made", len(automation["tool_calls"])),
+            error_message=automation["error_message"]
+        )
+
         # Log to database if enabled
         if settings["database"].enable_tool_call_logging:
             try:
                 await log_automation_result(db, process_id, result)
             except Exception as e:
-                print(f"⚠️ [WORKFLOW] Database logging failed: {e}")
+                workflow_logger.warning(f"⚠️ [WORKFLOW] Database logging failed: {e}")
 
         status = "✅ Completed" if result.get("success") else "❌ Failed"
-        print(f"{status} [WORKFLOW] Automation {process_id} finished")
+        workflow_logger.info(f"{status} [WORKFLOW] Automation {process_id} finished")
 
     except Exception as e:
         error_msg = f"Workflow execution failed: {e}"
-        print(f"❌ [WORKFLOW] {error_msg}")
+        workflow_logger.error(f"❌ [WORKFLOW] {error_msg}", exc_info=True)
 
-        automation["status"] = "failed"
+        set_status(automation, "failed")
         automation["error_message"] = error_msg
+        await run_db(db.record_automation_run, process_id, request.first_name, request.last_name,
+                     "failed", error_message=error_msg)
 
-        import traceback
-        traceback.print_exc()
+    finally:
+        automation["finished"] = True
+        if agent is not None:
+            release_agent(agent)
 
 async def log_automation_result(db, process_id: str, result: Dict[str, Any]):
     """Log automation result to database."""
@@ -449,15 +722,15 @@ async def log_automation_result(db, process_id: str, result: Dict[str, Any]):
             "created_at": datetime.now()
         }
 
-        # Log individual tool calls if available
-        tool_calls = result.get("recent_tool_calls", [])
-        for call in tool_calls:
-            await log_tool_call(db, process_id, call)
+        # Log individual tool calls if available, all in one transaction
+        tool_calls = result.get("tool_calls", [])
+        rows = [build_tool_call_row(process_id, call) for call in tool_calls]
+        await run_db(db.add_tool_calls, rows)
 
-        print(f"📊 [LOG] Logged automation result for {process_id}")
+        workflow_logger.info(f"📊 [LOG] Logged automation result for {process_id}")
 
     except Exception as e:
-        print(f"⚠️ [LOG] Database logging error: {e}")
+        workflow_logger.warning(f"⚠️ [LOG] Database logging error: {e}")
 
 if __name__ == "__main__":
     import uvicorn
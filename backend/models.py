@@ -4,40 +4,36 @@ Backend Models - Data models for agentic mobile automation system
 Enhanced models for tool calls, conversations, and automation tracking
 """
 
-from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any, Union
-from datetime import datetime
-from enum import Enum
-
-class LLMProvider(str, Enum):
-    """Supported LLM providers."""
-    GROQ = "groq"
-    GEMINI = "gemini" 
-    OPENAI = "openai"
-    ANTHROPIC = "anthropic"
-
-class AutomationStatus(str, Enum):
-    """Automation execution status."""
-    PENDING = "pending"
-    RUNNING = "running"
-    COMPLETED = "completed"
-    FAILED = "failed"
-    CANCELLED = "cancelled"
-
-class WorkflowStep(str, Enum):
-    """Workflow step identifiers."""
-    INIT = "init"
-    WELCOME = "welcome"
-    EMAIL = "email"
-    PASSWORD = "password"
-    DETAILS = "details"
-    NAME = "name"
-    CAPTCHA = "captcha"
-    AUTH_WAIT = "auth_wait"
-    POST_AUTH = "post_auth"
-    VERIFY = "verify"
-    CLEANUP = "cleanup"
-    ERROR = "error"
+from pydantic import BaseModel, BeforeValidator, ConfigDict, Field, TypeAdapter
+from typing import Annotated, Optional, List, Dict, Any, Union
+from datetime import datetime, date
+import time
+
+from .enums import LLMProvider, AutomationStatus, WorkflowStep, MessageType
+
+class FastBaseModel(BaseModel):
+    """Base for response/log models that are serialized on hot API paths."""
+
+    model_config = ConfigDict(ser_json_bytes="utf8")
+
+# (millisecond, datetime) of the last _now() call; replaced as one tuple so readers never see a torn pair
+_clock = (-1, None)
+
+def _now() -> datetime:
+    """Local wall-clock datetime at millisecond resolution, built at most once per millisecond."""
+    global _clock
+    ms = time.time_ns() // 1_000_000
+    cached_ms, value = _clock
+    if ms != cached_ms:
+        value = datetime.fromtimestamp(ms / 1000)
+        _clock = (ms, value)
+    return value
+
+def _iso_date_string(value: Any) -> str:
+    """Only a plain YYYY-MM-DD string: pydantic would also take timestamps and datetime strings."""
+    if not isinstance(value, str) or len(value) != 10:
+        raise ValueError("date_of_birth must be a YYYY-MM-DD string")
+    return value
 
 # ============================================================================
 # REQUEST MODELS
@@ -48,7 +44,8 @@ class AutomationRequest(BaseModel):
 
     first_name: str = Field(..., min_length=1, max_length=50, description="First name for account")
     last_name: str = Field(..., min_length=1, max_length=50, description="Last name for account")
-    date_of_birth: str = Field(..., pattern=r"\d{4}-\d{2}-\d{2}", description="Date of birth (YYYY-MM-DD)")
+    # Parsed by pydantic-core's native date parser (no regex), which also rejects impossible dates
+    date_of_birth: Annotated[date, BeforeValidator(_iso_date_string)] = Field(..., description="Date of birth (YYYY-MM-DD)")
     curp_id: Optional[str] = Field(None, max_length=18, description="CURP ID (optional)")
 
     # Agentic settings
@@ -73,7 +70,7 @@ class ToolCallRequest(BaseModel):
 # RESPONSE MODELS  
 # ============================================================================
 
-class AutomationResponse(BaseModel):
+class AutomationResponse(FastBaseModel):
     """Response model for automation operations."""
 
     process_id: str = Field(..., description="Unique process identifier")
@@ -106,7 +103,20 @@ class AutomationResponse(BaseModel):
     created_at: Optional[datetime] = Field(None, description="Creation timestamp")
     updated_at: Optional[datetime] = Field(None, description="Last update timestamp")
 
-class ToolCallResponse(BaseModel):
+    @classmethod
+    def from_db_row(cls, row: Dict[str, Any]) -> "AutomationResponse":
+        """Build from a trusted automation_runs row without validation. Never use on client input."""
+        return cls.model_construct(
+            process_id=row["process_id"],
+            status=AutomationStatus(row["status"]),
+            message=row["error_message"] or f"Automation {row['status']}",
+            progress_percentage=row["progress_percentage"] or 0,
+            account_email=row["account_email"],
+            duration_seconds=row["duration_seconds"],
+            tool_calls_made=row["tool_calls_made"],
+        )
+
+class ToolCallResponse(FastBaseModel):
     """Response model for tool call execution."""
 
     tool_name: str = Field(..., description="Name of executed tool")
@@ -114,8 +124,9 @@ class ToolCallResponse(BaseModel):
     success: bool = Field(..., description="Whether tool call succeeded")
     duration_ms: int = Field(..., description="Execution duration in milliseconds")
 
-    result: Dict[str, Any] = Field(..., description="Tool execution result")
-    parameters: Dict[str, Any] = Field(..., description="Parameters used")
+    # Opaque payloads: Any skips per-value validation and copying
+    result: Any = Field(..., description="Tool execution result")
+    parameters: Any = Field(..., description="Parameters used")
 
     timestamp: datetime = Field(..., description="Execution timestamp")
     error_message: Optional[str] = Field(None, description="Error message if failed")
@@ -124,49 +135,75 @@ class ToolCallResponse(BaseModel):
 # LOGGING MODELS
 # ============================================================================
 
-class ToolCallLog(BaseModel):
-    """Model for tool call logging."""
+class _LogBase(FastBaseModel):
+    """Fields shared by tool call and conversation log records."""
 
     id: Optional[int] = Field(None, description="Database ID")
     process_id: str = Field(..., description="Associated automation process ID")
 
+    # Context
+    step: Optional[WorkflowStep] = Field(None, description="Workflow step")
+
+    # Metadata
+    timestamp: datetime = Field(default_factory=_now, description="Record timestamp")
+
+class ToolCallLog(_LogBase):
+    """Model for tool call logging."""
+
     # Tool information
     tool_name: str = Field(..., description="Name of the tool")
     action: str = Field(..., description="Action performed")
-    parameters: Dict[str, Any] = Field(..., description="Tool parameters")
+    parameters: Any = Field(..., description="Tool parameters")
 
     # Execution details
     success: bool = Field(..., description="Whether execution succeeded")
     duration_ms: int = Field(..., description="Execution duration")
-    result: Dict[str, Any] = Field(..., description="Tool result")
+    result: Any = Field(..., description="Tool result")
     error_message: Optional[str] = Field(None, description="Error if failed")
 
     # Context
-    step: Optional[WorkflowStep] = Field(None, description="Workflow step during execution")
     retry_attempt: int = Field(0, description="Retry attempt number")
 
     # Metadata
-    timestamp: datetime = Field(default_factory=datetime.now, description="Execution timestamp")
     user_agent: Optional[str] = Field(None, description="User agent if applicable")
 
-class ConversationLog(BaseModel):
+    @classmethod
+    def from_db_row(cls, row: Dict[str, Any]) -> "ToolCallLog":
+        """Build from a trusted tool_calls row without validation. Never use on client input."""
+        timestamp = row.get("timestamp")
+        return cls.model_construct(
+            id=row["id"],
+            process_id=row["process_id"],
+            tool_name=row["tool_name"],
+            action=row["action"],
+            parameters=None,  # Not persisted in tool_calls
+            result=None,
+            success=bool(row["success"]),
+            duration_ms=row["duration_ms"],
+            timestamp=datetime.fromisoformat(timestamp) if isinstance(timestamp, str) else timestamp or _now(),
+        )
+
+class ConversationLog(_LogBase):
     """Model for conversation/message logging."""
 
-    id: Optional[int] = Field(None, description="Database ID")
-    process_id: str = Field(..., description="Associated automation process ID")
-
     # Message details
-    message_type: str = Field(..., description="Message type (human, ai, tool)")
+    message_type: MessageType = Field(..., description="Message type (human, ai, tool, system)")
     content: str = Field(..., description="Message content")
     tool_calls: Optional[List[Dict[str, Any]]] = Field(None, description="Associated tool calls")
 
     # Context
-    step: Optional[WorkflowStep] = Field(None, description="Workflow step")
     sequence_number: int = Field(..., description="Message order in conversation")
 
     # Metadata
-    timestamp: datetime = Field(default_factory=datetime.now, description="Message timestamp")
-    metadata: Optional[Dict[str, Any]] = Field(None, description="Additional metadata")
+    metadata: Optional[Any] = Field(None, description="Additional metadata")
+
+class OCRRegion(BaseModel):
+    """Screen rectangle in pixels."""
+
+    x: int
+    y: int
+    w: int
+    h: int
 
 class OCRResult(BaseModel):
     """Model for OCR result data."""
@@ -180,8 +217,8 @@ class OCRResult(BaseModel):
     word_count: int = Field(..., description="Number of words found")
 
     # Region information
-    region: Optional[Dict[str, int]] = Field(None, description="Screen region processed")
-    bounding_boxes: Optional[List[Dict[str, int]]] = Field(None, description="Text bounding boxes")
+    region: Optional[OCRRegion] = Field(None, description="Screen region processed")
+    bounding_boxes: Optional[List[OCRRegion]] = Field(None, description="Text bounding boxes")
 
     # Cache info
     cached: bool = Field(False, description="Whether result was cached")
@@ -191,7 +228,7 @@ class OCRResult(BaseModel):
 # SYSTEM STATUS MODELS
 # ============================================================================
 
-class SystemStatus(BaseModel):
+class SystemStatus(FastBaseModel):
     """System health and status information."""
 
     status: str = Field(..., description="Overall system status")
@@ -215,9 +252,9 @@ class SystemStatus(BaseModel):
     llm_providers_available: List[str] = Field(..., description="Available LLM providers")
 
     # Configuration
-    settings: Dict[str, Any] = Field(..., description="Current system settings")
+    settings: Any = Field(..., description="Current system settings")
 
-class AutomationStatistics(BaseModel):
+class AutomationStatistics(FastBaseModel):
     """Automation execution statistics."""
 
     # Time period
@@ -242,11 +279,19 @@ class AutomationStatistics(BaseModel):
     llm_usage_percent: float = Field(..., description="Percentage of automations using LLM")
     llm_provider_distribution: Dict[str, int] = Field(..., description="LLM provider usage")
 
+    @staticmethod
+    def success_rates_from_arrays(names, attempts, successes) -> Dict[str, float]:
+        """Per-tool success percentages from parallel name/attempt/success columns."""
+        return {
+            name: round(100.0 * ok / max(total, 1), 1)
+            for name, total, ok in zip(names, attempts, successes)
+        }
+
 # ============================================================================
 # EXPORT/IMPORT MODELS
 # ============================================================================
 
-class AutomationExport(BaseModel):
+class AutomationExport(FastBaseModel):
     """Complete automation data for export."""
 
     # Metadata
@@ -263,16 +308,16 @@ class AutomationExport(BaseModel):
     conversation: List[ConversationLog] = Field(..., description="Conversation log")
 
     # Performance data
-    performance_metrics: Dict[str, Any] = Field(..., description="Performance metrics")
+    performance_metrics: Any = Field(..., description="Performance metrics")
 
     # System context
-    system_info: Dict[str, Any] = Field(..., description="System information during execution")
+    system_info: Any = Field(..., description="System information during execution")
 
-class TraceData(BaseModel):
+class TraceData(FastBaseModel):
     """Detailed trace data for debugging."""
 
     process_id: str = Field(..., description="Process ID")
-    timeline: List[Dict[str, Any]] = Field(..., description="Chronological event timeline")
+    timeline: List[Any] = Field(..., description="Chronological event timeline")
 
     # Execution flow
     decision_points: List[Dict[str, Any]] = Field(..., description="LLM decision points")
@@ -324,13 +369,54 @@ class AgentConfiguration(BaseModel):
     save_screenshots: bool = Field(False, description="Save all screenshots")
     verbose_logging: bool = Field(False, description="Enable verbose logging")
 
+# ============================================================================
+# CACHED ADAPTERS
+# ============================================================================
+
+# Built once at import so hot paths reuse the compiled validator/serializer
+AUTOMATION_RESPONSE_ADAPTER = TypeAdapter(AutomationResponse)
+TOOL_CALL_LOG_ADAPTER = TypeAdapter(ToolCallLog)
+CONVERSATION_LOG_ADAPTER = TypeAdapter(ConversationLog)
+AUTOMATION_EXPORT_ADAPTER = TypeAdapter(AutomationExport)
+TRACE_DATA_ADAPTER = TypeAdapter(TraceData)
+
+_ADAPTERS = {
+    AutomationResponse: AUTOMATION_RESPONSE_ADAPTER,
+    ToolCallLog: TOOL_CALL_LOG_ADAPTER,
+    ConversationLog: CONVERSATION_LOG_ADAPTER,
+    AutomationExport: AUTOMATION_EXPORT_ADAPTER,
+    TraceData: TRACE_DATA_ADAPTER,
+}
+
+def validate(model_cls, data: Dict[str, Any]):
+    """Validate data into model_cls through its cached TypeAdapter."""
+    adapter = _ADAPTERS.get(model_cls)
+    if adapter is None:
+        return model_cls.model_validate(data)
+    return adapter.validate_python(data)
+
+def dump_json(model: BaseModel, **kwargs) -> bytes:
+    """JSON bytes by alias without unset fields, through the cached TypeAdapter when there is one."""
+    # No extra options is the common case: a literal dict skips the **kwargs merge
+    if not kwargs:
+        opts = {"by_alias": True, "exclude_unset": True}
+    else:
+        opts = dict(by_alias=True, exclude_unset=True, **kwargs)
+    adapter = _ADAPTERS.get(type(model))
+    if adapter is None:
+        return model.__pydantic_serializer__.to_json(model, **opts)
+    return adapter.dump_json(model, **opts)
+
 # Model exports for easy importing
 __all__ = [
-    "LLMProvider", "AutomationStatus", "WorkflowStep",
+    "FastBaseModel",
+    "LLMProvider", "AutomationStatus", "WorkflowStep", "MessageType",
     "AutomationRequest", "ToolCallRequest",
     "AutomationResponse", "ToolCallResponse",
-    "ToolCallLog", "ConversationLog", "OCRResult",
+    "ToolCallLog", "ConversationLog", "OCRRegion", "OCRResult",
     "SystemStatus", "AutomationStatistics",
     "AutomationExport", "TraceData",
-    "AgentConfiguration"
+    "AgentConfiguration",
+    "AUTOMATION_RESPONSE_ADAPTER", "TOOL_CALL_LOG_ADAPTER", "CONVERSATION_LOG_ADAPTER",
+    "AUTOMATION_EXPORT_ADAPTER", "TRACE_DATA_ADAPTER", "validate", "dump_json"
 ]
@@ -4,11 +4,26 @@ Backend Settings - Configuration for agentic mobile automation system
 Updated for enhanced OCR, tool orchestration, and LLM integration
 """
 
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, ClassVar, Dict, Final, FrozenSet, Mapping, Optional, Tuple
 import os
 
-@dataclass
+DEFAULT_SUCCESS_KEYWORDS = frozenset(["inbox", "search", "outlook"])
+DEFAULT_ERROR_KEYWORDS = frozenset(["error", "failed", "timeout", "not found"])
+# JSON body fields redacted from request logs
+DEFAULT_SENSITIVE_FIELDS = frozenset(["password", "account_password", "api_key", "token", "curp_id"])
+
+# (provider, key attribute, model attribute, key environment variable) for each LLM provider
+_PROVIDERS = (
+    ("groq", "groq_api_key", "groq_model", "GROQ_API_KEY"),
+    ("anthropic", "anthropic_api_key", "anthropic_model", "ANTHROPIC_API_KEY"),
+    ("openai", "openai_api_key", "openai_model", "OPENAI_API_KEY"),
+    ("gemini", "google_api_key", "google_model", "GOOGLE_API_KEY"),
+)
+
+@dataclass(slots=True)
 class LLMSettings:
     """LLM provider settings with updated model defaults."""
     default_provider: str = "gemini"
@@ -32,14 +47,37 @@ class LLMSettings:
     google_api_key: Optional[str] = None
     google_model: str = "gemini-2.0-flash"  # Updated to Gemini 2.0 Flash
 
-    def __post_init__(self):
-        """Load API keys from environment variables."""
-        self.groq_api_key = self.groq_api_key or os.getenv("GROQ_API_KEY")
-        self.anthropic_api_key = self.anthropic_api_key or os.getenv("ANTHROPIC_API_KEY")
-        self.openai_api_key = self.openai_api_key or os.getenv("OPENAI_API_KEY")
-        self.google_api_key = self.google_api_key or os.getenv("GOOGLE_API_KEY")
+    # Built on first get_llm_providers_config() call; settings do not change after import
+    _providers_cache: Optional[Dict[str, Dict[str, Any]]] = field(default=None, init=False, repr=False, compare=False)
+
+    # Key attribute and environment variable per provider, resolved only when asked for
+    _KEY_SOURCES: ClassVar[Dict[str, Tuple[str, str]]] = {
+        name: (key_attr, env_name) for name, key_attr, _, env_name in _PROVIDERS
+    }
 
-@dataclass
+    def get_api_key(self, provider: str) -> Optional[str]:
+        """API key for a provider: the explicit setting, else its environment variable."""
+        attr, env_name = self._KEY_SOURCES[provider]
+        return getattr(self, attr) or os.getenv(env_name)
+
+    @property
+    def api_key(self) -> Optional[str]:
+        """API key of the default provider."""
+        return self.get_api_key(self.default_provider)
+
+    def _build_providers_config(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            name: {"configured": bool(self.get_api_key(name)), "model": getattr(self, model_attr)}
+            for name, _, model_attr, _ in _PROVIDERS
+        }
+
+    def get_llm_providers_config(self) -> Dict[str, Dict[str, Any]]:
+        """Per-provider key presence and model, computed once per settings instance."""
+        if self._providers_cache is None:
+            self._providers_cache = self._build_providers_config()
+        return self._providers_cache
+
+@dataclass(slots=True)
 class OCRSettings:
     """OCR and image processing settings."""
     default_engine: str = "tesseract"  # tesseract, paddleocr, easyocr
@@ -61,7 +99,7 @@ class OCRSettings:
     enable_region_ocr: bool = True
     max_region_cache: int = 20
 
-@dataclass
+@dataclass(slots=True)
 class AgentSettings:
     """Agentic automation settings."""
     use_llm: bool = True
@@ -78,17 +116,22 @@ class AgentSettings:
     # NEW: raise LangGraph recursion ceiling
     recursion_limit: int = 150
 
+    # Per-automation history kept in API memory (full tool call history is in the database)
+    max_messages_in_memory: int = 500
+    max_tool_calls_in_memory: int = 500
+
+    # Idle agents kept per (use_llm, provider) for reuse by the API
+    agent_pool_size: int = 4
+
     # Success detection
-    success_keywords: list = None
-    error_keywords: list = None
+    success_keywords: FrozenSet[str] = field(default_factory=lambda: DEFAULT_SUCCESS_KEYWORDS)
+    error_keywords: FrozenSet[str] = field(default_factory=lambda: DEFAULT_ERROR_KEYWORDS)
 
     def __post_init__(self):
-        if self.success_keywords is None:
-            self.success_keywords = ["inbox", "search", "outlook"]
-        if self.error_keywords is None:
-            self.error_keywords = ["error", "failed", "timeout", "not found"]
+        self.success_keywords = frozenset(self.success_keywords or DEFAULT_SUCCESS_KEYWORDS)
+        self.error_keywords = frozenset(self.error_keywords or DEFAULT_ERROR_KEYWORDS)
 
-@dataclass  
+@dataclass(slots=True, frozen=True)
 class AppiumSettings:
     """Appium driver settings."""
     platform_name: str = "Android"
@@ -109,7 +152,7 @@ class AppiumSettings:
     auto_grant_permissions: bool = True
     disable_window_animation: bool = True
 
-@dataclass
+@dataclass(slots=True)
 class DatabaseSettings:
     """Database configuration."""
     database_url: str = "sqlite:///./outlook_automation.db"
@@ -121,7 +164,7 @@ class DatabaseSettings:
     enable_conversation_logging: bool = True
     retention_days: int = 30
 
-@dataclass
+@dataclass(slots=True)
 class APISettings:
     """API server settings."""
     host: str = "0.0.0.0"
@@ -142,6 +185,9 @@ class APISettings:
     enable_tool_tracing: bool = True
     enable_conversation_export: bool = True
 
+    # Automations kept in memory; older finished runs are evicted
+    max_active: int = 1000
+
     def __post_init__(self):
         if self.allow_origins is None:
             self.allow_origins = ["*"]
@@ -150,7 +196,7 @@ class APISettings:
         if self.allow_headers is None:
             self.allow_headers = ["*"]
 
-@dataclass
+@dataclass(slots=True)
 class LoggingSettings:
     """Logging configuration for agentic system."""
     level: str = "INFO"
@@ -159,9 +205,15 @@ class LoggingSettings:
     # File logging
     enable_file_logging: bool = True
     log_file: str = "logs/automation.log"
-    max_file_size: str = "10MB"
+    max_file_size: int = 10 * 1024 * 1024  # Bytes before the log file is rotated
     backup_count: int = 5
 
+    # Request logging
+    log_requests: bool = True
+    log_responses: bool = True
+    max_body_bytes: int = 10 * 1024  # Larger request bodies are not read for logging
+    sensitive_fields: FrozenSet[str] = field(default_factory=lambda: DEFAULT_SENSITIVE_FIELDS)
+
     # Structured logging for tools
     enable_structured_logging: bool = True
     structured_log_file: str = "logs/tool_calls.jsonl"
@@ -172,17 +224,18 @@ class LoggingSettings:
     tool_call_format: str = "banner"  # banner, json, minimal
 
 # Global settings instances
-llm_settings = LLMSettings()
-ocr_settings = OCRSettings()
-agent_settings = AgentSettings()
-appium_settings = AppiumSettings()
-database_settings = DatabaseSettings()
-api_settings = APISettings()
-logging_settings = LoggingSettings()
-
-def get_settings():
-    """Get all settings as a dictionary."""
-    return {
+llm_settings: Final = LLMSettings()
+ocr_settings: Final = OCRSettings()
+agent_settings: Final = AgentSettings()
+appium_settings: Final = AppiumSettings()
+database_settings: Final = DatabaseSettings()
+api_settings: Final = APISettings()
+logging_settings: Final = LoggingSettings()
+
+@lru_cache(maxsize=1)
+def get_settings() -> Mapping[str, Any]:
+    """Get all settings as a read-only mapping, built once."""
+    return MappingProxyType({
         "llm": llm_settings,
         "ocr": ocr_settings,
         "agent": agent_settings,
@@ -190,14 +243,21 @@ def get_settings():
         "database": database_settings,
         "api": api_settings,
         "logging": logging_settings
-    }
+    })
+
+@lru_cache(maxsize=1)
+def _settings_summary() -> str:
+    """Format the settings summary once; settings are not changed after import."""
+    return "\n".join([
+        "⚙️ [SETTINGS] Configuration Summary:",
+        f"  🤖 LLM: {llm_settings.default_provider} ({llm_settings.groq_model})",
+        f"  👁️ OCR: {ocr_settings.default_engine} (preprocessing: {ocr_settings.enable_preprocessing})",
+        f"  🧠 Agent: LLM {'enabled' if agent_settings.use_llm else 'disabled'} (max tools: {agent_settings.max_tool_calls})",
+        f"  📱 Appium: {appium_settings.device_name}",
+        f"  🌐 API: {api_settings.host}:{api_settings.port}",
+        f"  📊 Database: {database_settings.database_url}",
+    ])
 
 def print_settings_summary():
     """Print a summary of current settings."""
-    print("⚙️ [SETTINGS] Configuration Summary:")
-    print(f"  🤖 LLM: {llm_settings.default_provider} ({llm_settings.groq_model})")
-    print(f"  👁️ OCR: {ocr_settings.default_engine} (preprocessing: {ocr_settings.enable_preprocessing})")
-    print(f"  🧠 Agent: LLM {'enabled' if agent_settings.use_llm else 'disabled'} (max tools: {agent_settings.max_tool_calls})")
-    print(f"  📱 Appium: {appium_settings.device_name}")
-    print(f"  🌐 API: {api_settings.host}:{api_settings.port}")
-    print(f"  📊 Database: {database_settings.database_url}")
+    print(_settings_summary())
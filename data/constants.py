@@ -4,33 +4,45 @@ Data Constants for Mobile Outlook Agent
 Names, dates, and other test data
 """
 
+import calendar
 import random
-from typing import Dict, Any
-from datetime import datetime
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Dict, Any, List, Mapping, Optional
+from datetime import date
+
+if TYPE_CHECKING:
+    import numpy as np
 
 # First names for account generation
-FIRST_NAMES = [
+FIRST_NAMES = (
     "mary", "john", "david", "michael", "sarah", "jennifer", "william", "elizabeth", "robert", "lisa",
     "james", "maria", "christopher", "nancy", "daniel", "karen", "matthew", "betty", "anthony", "helen",
     "mark", "sandra", "donald", "donna", "steven", "carol", "paul", "ruth", "andrew", "sharon",
-    "joshua", "michelle", "kenneth", "laura", "kevin", "sarah", "brian", "kimberly", "george", "deborah",
-    "edward", "dorothy", "ronald", "lisa", "timothy", "nancy", "jason", "karen", "jeffrey", "betty"
-]
+    "joshua", "michelle", "kenneth", "laura", "kevin", "brian", "kimberly", "george", "deborah", "edward",
+    "dorothy", "ronald", "timothy", "jason", "jeffrey"
+)
 
 # Last names for account generation
-LAST_NAMES = [
+LAST_NAMES = (
     "smith", "johnson", "williams", "brown", "jones", "garcia", "miller", "davis", "rodriguez", "martinez",
     "hernandez", "lopez", "gonzalez", "wilson", "anderson", "thomas", "taylor", "moore", "jackson", "martin",
     "lee", "perez", "thompson", "white", "harris", "sanchez", "clark", "ramirez", "lewis", "robinson",
     "walker", "young", "allen", "king", "wright", "scott", "torres", "nguyen", "hill", "flores",
     "green", "adams", "nelson", "baker", "hall", "rivera", "campbell", "mitchell", "carter", "roberts"
-]
+)
+
+# Keep each name once (first occurrence) so sampling stays uniform if the lists are extended
+FIRST_NAMES = tuple(dict.fromkeys(FIRST_NAMES))
+LAST_NAMES = tuple(dict.fromkeys(LAST_NAMES))
 
 # Full month names for Outlook
-MONTHS = [
+MONTHS = (
     "January", "February", "March", "April", "May", "June",
     "July", "August", "September", "October", "November", "December"
-]
+)
+
+# Days per month in a common year, indexed by month - 1
+_DAYS_IN_MONTH = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
 
 # Real CURP IDs for testing (placeholder - will be filled later)
 REAL_CURP_IDS = [
@@ -52,17 +64,9 @@ def generate_demo_data() -> Dict[str, Any]:
     birth_year = random.randint(1980, 2005)
     birth_month = random.randint(1, 12)
 
-    # Handle different month lengths
-    if birth_month in [1, 3, 5, 7, 8, 10, 12]:
-        birth_day = random.randint(1, 31)
-    elif birth_month in [4, 6, 9, 11]:
-        birth_day = random.randint(1, 30)
-    else:  # February
-        # Handle leap years
-        if birth_year % 4 == 0 and (birth_year % 100 != 0 or birth_year % 400 == 0):
-            birth_day = random.randint(1, 29)
-        else:
-            birth_day = random.randint(1, 28)
+    # Handle different month lengths (February gains a day in leap years)
+    max_day = _DAYS_IN_MONTH[birth_month - 1] + (birth_month == 2 and calendar.isleap(birth_year))
+    birth_day = random.randint(1, max_day)
 
     # Format as YYYY-MM-DD
     date_of_birth = f"{birth_year:04d}-{birth_month:02d}-{birth_day:02d}"
@@ -78,6 +82,47 @@ def generate_demo_data() -> Dict[str, Any]:
         "age": 2025 - birth_year
     }
 
+# Batch generation lookups, built once at import
+_FIRST_TITLES = tuple(name.title() for name in FIRST_NAMES)
+_LAST_TITLES = tuple(name.title() for name in LAST_NAMES)
+
+def generate_demo_data_batch(n: int, rng: Optional["np.random.Generator"] = None) -> List[Dict[str, Any]]:
+    """
+    Generate n demo records like generate_demo_data, sampling every column in one vectorized pass
+    Requires numpy, imported here so the rest of this module works without it
+    """
+    import numpy as np
+
+    rng = rng or np.random.default_rng()
+
+    first_idx = rng.integers(0, len(_FIRST_TITLES), n).tolist()
+    last_idx = rng.integers(0, len(_LAST_TITLES), n).tolist()
+
+    # Birth dates (1980-2005); February gains a day in leap years
+    years = rng.integers(1980, 2006, n)
+    months = rng.integers(1, 13, n)
+    leap = (years % 4 == 0) & ((years % 100 != 0) | (years % 400 == 0))
+    max_days = np.array(_DAYS_IN_MONTH)[months - 1] + ((months == 2) & leap)
+    days = rng.integers(1, max_days + 1)
+
+    if REAL_CURP_IDS:
+        curp_ids = [REAL_CURP_IDS[i] for i in rng.integers(0, len(REAL_CURP_IDS), n).tolist()]
+    else:
+        curp_ids = ["DEMO123456HDFRNN01"] * n
+
+    return [
+        {
+            "curp_id": curp_id,
+            "first_name": _FIRST_TITLES[fi],
+            "last_name": _LAST_TITLES[li],
+            "date_of_birth": f"{year:04d}-{month:02d}-{day:02d}",
+            "age": 2025 - year
+        }
+        for curp_id, fi, li, year, month, day in zip(
+            curp_ids, first_idx, last_idx, years.tolist(), months.tolist(), days.tolist()
+        )
+    ]
+
 def generate_outlook_email(first_name: str, last_name: str) -> str:
     """
     Generate Outlook email address
@@ -95,6 +140,21 @@ def generate_outlook_email(first_name: str, last_name: str) -> str:
     username = f"{first_clean}{first_numbers}{last_clean}{last_numbers}"
     return f"{username}@outlook.com"
 
+def _split_date(date_string: str):
+    """Slice a YYYY-MM-DD string into (year, month, day) ints; ValueError if malformed or impossible."""
+    if len(date_string) != 10 or date_string[4] != "-" or date_string[7] != "-":
+        raise ValueError(date_string)
+    parts = date_string[:4], date_string[5:7], date_string[8:]
+    # int() alone would accept spaces, "_" and a leading "+" inside a field
+    if not date_string.isascii() or not all(part.isdigit() for part in parts):
+        raise ValueError(date_string)
+    year, month, day = map(int, parts)
+    if year < 1 or not 1 <= month <= 12:
+        raise ValueError(date_string)
+    if not 1 <= day <= _DAYS_IN_MONTH[month - 1] + (month == 2 and calendar.isleap(year)):
+        raise ValueError(date_string)
+    return year, month, day
+
 def parse_birth_date(date_string: str) -> Dict[str, Any]:
     """
     Parse date string into components for Outlook
@@ -106,16 +166,17 @@ def parse_birth_date(date_string: str) -> Dict[str, Any]:
         Dictionary with day, month, year components
     """
     try:
-        date_obj = datetime.strptime(date_string, "%Y-%m-%d")
+        year, month, day = _split_date(date_string)
         return {
-            "day": date_obj.day,
-            "month": MONTHS[date_obj.month - 1],  # Full month name
-            "year": date_obj.year
+            "day": day,
+            "month": MONTHS[month - 1],  # Full month name
+            "year": year
         }
     except ValueError as e:
         raise ValueError(f"Invalid date format. Expected YYYY-MM-DD, got: {date_string}")
 
-def validate_age(date_of_birth: str, min_age: int = 18, max_age: int = 100) -> bool:
+def validate_age(date_of_birth: str, min_age: int = 18, max_age: int = 100,
+                 today: Optional[date] = None) -> bool:
     """
     Validate age is within acceptable range
 
@@ -123,14 +184,16 @@ def validate_age(date_of_birth: str, min_age: int = 18, max_age: int = 100) -> b
         date_of_birth: Date string YYYY-MM-DD
         min_age: Minimum acceptable age
         max_age: Maximum acceptable age
+        today: Reference date; pass one date.today() when validating a batch
 
     Returns:
         True if age is valid
     """
     try:
-        birth_date = datetime.strptime(date_of_birth, "%Y-%m-%d")
-        today = datetime.now()
-        age = today.year - birth_date.year - ((today.month, today.day) < (birth_date.month, birth_date.day))
+        year, month, day = _split_date(date_of_birth)
+        if today is None:
+            today = date.today()
+        age = today.year - year - ((today.month, today.day) < (month, day))
         return min_age <= age <= max_age
     except ValueError:
         return False
@@ -172,20 +235,23 @@ POST_AUTH_BUDGET = 7.0       # 7 seconds
 MAX_RETRIES = 3
 RETRY_DELAY = 0.5
 
-def get_app_config() -> Dict[str, Any]:
+# App configuration, built once at import; read-only because every caller shares it
+_APP_CONFIG = MappingProxyType({
+    "app_package": OUTLOOK_APP_PACKAGE,
+    "app_activity": OUTLOOK_APP_ACTIVITY,
+    "appium_url": APPIUM_SERVER_URL,
+    "timeouts": MappingProxyType({
+        "element": ELEMENT_TIMEOUT,
+        "long_press": LONG_PRESS_DURATION,
+        "auth_wait": AUTH_WAIT_TIMEOUT,
+        "post_auth": POST_AUTH_BUDGET
+    }),
+    "retries": MappingProxyType({
+        "max_retries": MAX_RETRIES,
+        "delay": RETRY_DELAY
+    })
+})
+
+def get_app_config() -> Mapping[str, Any]:
     """Get app configuration"""
-    return {
-        "app_package": OUTLOOK_APP_PACKAGE,
-        "app_activity": OUTLOOK_APP_ACTIVITY,
-        "appium_url": APPIUM_SERVER_URL,
-        "timeouts": {
-            "element": ELEMENT_TIMEOUT,
-            "long_press": LONG_PRESS_DURATION,
-            "auth_wait": AUTH_WAIT_TIMEOUT,
-            "post_auth": POST_AUTH_BUDGET
-        },
-        "retries": {
-            "max_retries": MAX_RETRIES,
-            "delay": RETRY_DELAY
-        }
-    }
+    return _APP_CONFIG
@@ -5,11 +5,38 @@ Production-ready driver setup based on comp.py patterns
 """
 
 import time
-from typing import Optional, Dict, Any
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Optional, Dict, Any, Mapping
 from appium import webdriver
 from appium.options.android import UiAutomator2Options
 from appium.webdriver.common.appiumby import AppiumBy
 
+# Seconds a check_driver_health result is reused before probing Appium again
+HEALTH_CHECK_TTL = 0.5
+
+# Capabilities shared by every session (comp.py pattern); only the app varies per call
+_CAPABILITIES_TEMPLATE = MappingProxyType({
+    "platformName": "Android",
+    "appium:deviceName": "Android",
+    "appium:automationName": "UiAutomator2",
+    "appium:noReset": False,
+    "appium:fullReset": False,
+    "appium:newCommandTimeout": 300,
+    "appium:unicodeKeyboard": True,
+    "appium:resetKeyboard": True,
+    "appium:autoGrantPermissions": True,
+})
+
+@lru_cache(maxsize=8)
+def get_capabilities(app_package: str, app_activity: str) -> Mapping[str, Any]:
+    """UiAutomator2 capabilities for an app, built once per (package, activity)."""
+    return MappingProxyType({
+        **_CAPABILITIES_TEMPLATE,
+        "appium:appPackage": app_package,
+        "appium:appActivity": app_activity,
+    })
+
 class AppiumClient:
     """Appium driver setup and lifecycle management"""
 
@@ -19,6 +46,11 @@ class AppiumClient:
         self.appium_url = appium_url
         self.driver = None
         self.screen_size = None
+        self._caps: Dict[str, Any] = {}  # Session capabilities, snapshotted once in setup_driver
+
+        # Last check_driver_health result, reused for HEALTH_CHECK_TTL seconds
+        self._health_cached_at = 0.0
+        self._health_cached_val = False
 
     def setup_driver(self, app_activity: str = '.MainActivity') -> bool:
         """
@@ -35,21 +67,12 @@ class AppiumClient:
             print(f"🚀 Setting up Appium driver for {self.app_package}...")
 
             # Setup UiAutomator2 options (comp.py pattern)
-            options = UiAutomator2Options()
-            options.platform_name = 'Android'
-            options.device_name = 'Android'  
-            options.app_package = self.app_package
-            options.app_activity = app_activity
-            options.automation_name = 'UiAutomator2'
-            options.no_reset = False
-            options.full_reset = False
-            options.new_command_timeout = 300
-            options.unicode_keyboard = True
-            options.reset_keyboard = True
-            options.auto_grant_permissions = True
+            options = UiAutomator2Options().load_capabilities(get_capabilities(self.app_package, app_activity))
 
             # Connect to Appium server
             self.driver = webdriver.Remote(self.appium_url, options=options)
+            self._caps = dict(self.driver.capabilities)
+            self._health_cached_at = 0.0
 
             # Apply production settings (comp.py pattern)
             self.driver.update_settings({"enforceXPath1": True})
@@ -81,6 +104,7 @@ class AppiumClient:
         try:
             if self.driver:
                 self.driver.quit()
+                self._health_cached_at = 0.0
                 print("✅ Driver quit successfully")
             return True
         except Exception as e:
@@ -112,23 +136,33 @@ class AppiumClient:
             return False
 
     def check_driver_health(self) -> bool:
-        """Check if driver is still responsive"""
+        """Check if driver is still responsive (probes at most once per HEALTH_CHECK_TTL)"""
+        now = time.monotonic()
+        if now - self._health_cached_at < HEALTH_CHECK_TTL:
+            return self._health_cached_val
+
+        healthy = False
         try:
             if self.driver:
-                # Simple health check
+                # Simple health check (one Appium round trip)
                 self.driver.current_activity
-                return True
+                healthy = True
         except:
-            return False
+            healthy = False
+
+        self._health_cached_at = now
+        self._health_cached_val = healthy
+        return healthy
 
     def get_device_info(self) -> Dict[str, Any]:
         """Get device information for debugging"""
         try:
             if self.driver:
+                caps = self._caps
                 return {
-                    "platform_name": self.driver.capabilities.get('platformName'),
-                    "platform_version": self.driver.capabilities.get('platformVersion'),
-                    "device_name": self.driver.capabilities.get('deviceName'),
+                    "platform_name": caps.get('platformName'),
+                    "platform_version": caps.get('platformVersion'),
+                    "device_name": caps.get('deviceName'),
                     "app_package": self.app_package,
                     "screen_size": self.screen_size,
                     "current_activity": self.driver.current_activity
@@ -4,15 +4,28 @@ LLM Client - Unified interface for multiple LLM providers
 Supports Anthropic Claude, OpenAI GPT, Google Gemini, and Groq (ChatGroq)
 
 Key behaviors:
-- Groq (ChatGroq): Instantiate per-call with model=<id>; do NOT mutate a .model attribute
+- Groq (ChatGroq): one instance per (model, temperature), max_tokens bound per call; do NOT mutate a .model attribute
 - Groq deprecation fallback: auto-retry once with recommended replacement when model is decommissioned
 - Gemini: default to gemini-2.0-flash; on 429/quota, return structured error and optionally fallback to Groq
+- Async: agenerate_response / agenerate_batch use each SDK's async client for concurrent fan-out
 """
 
 import os
 import json
-from typing import Dict, Any, Optional, List
-from enum import Enum
+import orjson
+import time
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import weakref
+import importlib
+import importlib.util
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Any, Optional, List, Tuple
+
+from backend.enums import LLMProvider
 
 # Groq deprecation replacement map (extend with future deprecations)
 GROQ_MODEL_REPLACEMENTS = {
@@ -23,11 +36,321 @@ GROQ_MODEL_REPLACEMENTS = {
     # Add other mappings as necessary based on Groq’s deprecations page
 }
 
-class LLMProvider(Enum):
-    ANTHROPIC = "anthropic"
-    OPENAI = "openai"
-    GEMINI = "gemini"
-    GROQ = "groq"
+# Vendor SDK per provider, imported only when that provider is first used
+_PROVIDER_MODULES: Dict[LLMProvider, str] = {
+    LLMProvider.GROQ: "langchain_groq",
+    LLMProvider.ANTHROPIC: "anthropic",
+    LLMProvider.OPENAI: "openai",
+    LLMProvider.GEMINI: "google.generativeai",
+}
+
+# API key environment variable per provider
+_PROVIDER_KEY_ENV: Dict[LLMProvider, str] = {
+    LLMProvider.GROQ: "GROQ_API_KEY",
+    LLMProvider.ANTHROPIC: "ANTHROPIC_API_KEY",
+    LLMProvider.OPENAI: "OPENAI_API_KEY",
+    LLMProvider.GEMINI: "GOOGLE_API_KEY",
+}
+
+# Exact-match response cache: only near-deterministic calls are cached
+RESPONSE_CACHE_MAX_SIZE = 2048
+RESPONSE_CACHE_TTL = 1800  # seconds
+CACHEABLE_MAX_TEMPERATURE = 0.2
+
+# Optional persistent tier behind the in-memory cache, so restarted runs replay earlier answers.
+# Off by default: replayed answers can be stale for a changed screen (LLM_CACHE_DISK=1 enables it;
+# LLM_CACHE_DIR moves it)
+DISK_CACHE_TTL = 7 * 24 * 3600  # seconds
+DEFAULT_LLM_CACHE_DIR = "~/.outlook_agent_llm_cache"
+
+# Default requests per minute for the async path, overridable via <PROVIDER>_QPM
+_PROVIDER_QPM: Dict[LLMProvider, int] = {
+    LLMProvider.GROQ: 500,
+    LLMProvider.GEMINI: 500,
+    LLMProvider.OPENAI: 500,
+    LLMProvider.ANTHROPIC: 200,
+}
+
+# Output budget when the caller leaves max_tokens unset: DEFAULT_MAX_TOKENS, clamped so prompt plus
+# reply fit CONTEXT_TOKEN_BUDGET, but never below MIN_AUTO_MAX_TOKENS
+DEFAULT_MAX_TOKENS = 2048
+CONTEXT_TOKEN_BUDGET = 4096
+MIN_AUTO_MAX_TOKENS = 256
+TOKEN_MARGIN = 32
+
+# Output budgets for the built-in prompts (the error analysis JSON is short)
+ERROR_ANALYSIS_MAX_TOKENS = 384
+AUTOMATION_INSTRUCTIONS_MAX_TOKENS = 1024
+
+# Anthropic ignores cache_control on prefixes shorter than this (Sonnet/Opus; Haiku needs 2048)
+ANTHROPIC_CACHE_MIN_TOKENS = 1024
+
+# Seconds a hedged request waits on its primary provider before also starting the backup
+HEDGE_DELAY = 0.4
+
+# Static instruction blocks, sent as the system prompt so providers can cache the prefix.
+# Keep per-call values out of these: any change breaks the cached prefix for every call.
+ERROR_ANALYSIS_SYSTEM = """
+You are an expert mobile automation assistant. Analyze the automation error given by the user and provide suggestions.
+
+Please provide:
+1. Likely cause of the error
+2. Suggested solution/retry strategy
+3. Alternative approaches
+4. Whether this is a critical failure or can be skipped
+
+Respond in JSON with keys: cause, solution, alternatives, critical
+""".strip()
+
+# Forced-JSON request for error analysis; "schema" is applied by Gemini, the others get JSON mode
+ERROR_ANALYSIS_FORMAT = {
+    "type": "json_object",
+    "schema": {
+        "type": "object",
+        "properties": {
+            "cause": {"type": "string"},
+            "solution": {"type": "string"},
+            "alternatives": {"type": "array", "items": {"type": "string"}},
+            "critical": {"type": "boolean"},
+        },
+    },
+}
+
+AUTOMATION_INSTRUCTIONS_SYSTEM = """
+You are a mobile automation expert. Generate step-by-step instructions for the task given by the user.
+
+Provide detailed steps that can be executed by an automation framework.
+Consider element selectors, timing, backoff, and robust error handling.
+
+Respond with a structured plan.
+""".strip()
+
+@lru_cache(maxsize=None)
+def load_provider(provider: LLMProvider):
+    """Import and return the SDK module for a provider."""
+    return importlib.import_module(_PROVIDER_MODULES[provider])
+
+# Request builders shared by the sync and async provider paths
+def _chat_messages(prompt: str, system: Optional[str], roles=("system", "human"), as_dicts: bool = False) -> list:
+    """Chat messages with the static system text (if any) ahead of the per-call prompt."""
+    pairs = ((roles[0], system), (roles[1], prompt)) if system else ((roles[1], prompt),)
+    if as_dicts:
+        return [{"role": role, "content": content} for role, content in pairs]
+    return list(pairs)
+
+def _dump_context(context: Dict[str, Any]) -> str:
+    """Compact JSON for prompt context; sorted keys keep equal contexts byte-identical for caching."""
+    return orjson.dumps(context, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str).decode()
+
+def _chat_format(response_format: Dict[str, Any]) -> Dict[str, Any]:
+    """OpenAI-style response_format; the Gemini-only "schema" entry is dropped."""
+    return {k: v for k, v in response_format.items() if k != "schema"}
+
+def _gemini_config(temperature: float, max_tokens: int, response_format: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    config = {"temperature": temperature, "max_output_tokens": max_tokens}
+    if response_format:
+        config["response_mime_type"] = "application/json"
+        if response_format.get("schema"):
+            config["response_schema"] = response_format["schema"]
+    return config
+
+def _anthropic_system(system: Optional[str]) -> Dict[str, Any]:
+    """Anthropic system kwargs; the text is marked as a cacheable prefix only when it is long enough to be cached."""
+    if not system:
+        return {}
+    block = {"type": "text", "text": system}
+    if estimate_tokens(system) >= ANTHROPIC_CACHE_MIN_TOKENS:
+        block["cache_control"] = {"type": "ephemeral"}
+    return {"system": [block]}
+
+def _json_complete(text: str) -> bool:
+    """True once streamed text parses as a whole top-level JSON object."""
+    text = text.strip()
+    # Braces inside strings can balance early, so only a full parse decides
+    if not (text.startswith("{") and text.endswith("}")):
+        return False
+    try:
+        return isinstance(orjson.loads(text), dict)
+    except orjson.JSONDecodeError:
+        return False
+
+def _groq_stream(llm, messages):
+    """Stream a ChatGroq reply into one message chunk, stopping early once a JSON object closes."""
+    acc = None
+    chunks = llm.stream(messages)
+    try:
+        for chunk in chunks:
+            acc = chunk if acc is None else acc + chunk
+            if _json_complete(acc.content):
+                break
+    finally:
+        chunks.close()
+    if acc is None:
+        raise RuntimeError("Groq stream returned no content")
+    return acc
+
+async def _agroq_stream(llm, messages):
+    """Async twin of _groq_stream using ChatGroq.astream."""
+    acc = None
+    chunks = llm.astream(messages)
+    try:
+        async for chunk in chunks:
+            acc = chunk if acc is None else acc + chunk
+            if _json_complete(acc.content):
+                break
+    finally:
+        await chunks.aclose()
+    if acc is None:
+        raise RuntimeError("Groq stream returned no content")
+    return acc
+
+# Error classification: typed checks first, message matching only as a last resort
+@lru_cache(maxsize=None)
+def _error_types(module: str, *names: str) -> tuple:
+    """Exception classes from an SDK module; empty when the module is not installed."""
+    try:
+        mod = importlib.import_module(module)
+    except ImportError:
+        return ()
+    return tuple(getattr(mod, name) for name in names if hasattr(mod, name))
+
+def _is_groq_decommissioned(e: Exception) -> bool:
+    if isinstance(e, _error_types("groq", "APIStatusError")):
+        code = getattr(e, "code", None)
+        body = getattr(e, "body", None)
+        if code is None and isinstance(body, dict):
+            code = body.get("code") or (body.get("error") or {}).get("code")
+        if code is not None:
+            return code == "model_decommissioned"
+    return "decommissioned" in str(e)
+
+def _is_gemini_quota(e: Exception) -> bool:
+    if isinstance(e, _error_types("google.api_core.exceptions", "ResourceExhausted")):
+        return True
+    msg = str(e)
+    return "429" in msg or "quota" in msg.lower()
+
+# Response builders shared by the sync and async provider paths
+def _groq_result(resp, model_id: str, **extra) -> Dict[str, Any]:
+    return {
+        "success": True,
+        "response": resp.content,
+        "provider": "groq",
+        "model": model_id,
+        "metadata": {
+            "usage": getattr(resp, "usage_metadata", None),
+            "reasoning": getattr(resp, "additional_kwargs", {}).get("reasoning_content"),
+            **extra,
+        },
+    }
+
+def _anthropic_result(resp, mdl: str) -> Dict[str, Any]:
+    content = getattr(resp, "content", None)
+    text = content[0].text if content else ""
+    usage = getattr(resp, "usage", None)
+    usage = {"input_tokens": getattr(usage, "input_tokens", None),
+             "output_tokens": getattr(usage, "output_tokens", None),
+             "cache_read_input_tokens": getattr(usage, "cache_read_input_tokens", None),
+             "cache_creation_input_tokens": getattr(usage, "cache_creation_input_tokens", None)}
+    return {"success": True, "response": text, "provider": "anthropic", "model": mdl, "metadata": {"usage": usage}}
+
+def _openai_result(resp, mdl: str) -> Dict[str, Any]:
+    usage = {"prompt_tokens": resp.usage.prompt_tokens, "completion_tokens": resp.usage.completion_tokens, "total_tokens": resp.usage.total_tokens}
+    return {"success": True, "response": resp.choices[0].message.content, "provider": "openai", "model": mdl, "metadata": {"usage": usage}}
+
+def _gemini_error(e: Exception, mdl: str) -> Dict[str, Any]:
+    if _is_gemini_quota(e):
+        return {
+            "success": False,
+            "error": f"quota_exceeded:{e}",
+            "provider": "gemini",
+            "model": mdl,
+            "metadata": {"hint": "Retry with server-provided delay or fallback to another provider"},
+        }
+    return {"success": False, "error": f"{e}", "provider": "gemini", "model": mdl}
+
+@lru_cache(maxsize=1)
+def _token_encoder():
+    """cl100k_base tokenizer when tiktoken is installed, else None."""
+    try:
+        return importlib.import_module("tiktoken").get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+def estimate_tokens(text: str) -> int:
+    """Token count via tiktoken, or a ~4 characters per token estimate without it."""
+    enc = _token_encoder()
+    if enc is not None:
+        return len(enc.encode(text, disallowed_special=()))
+    return len(text) // 4 + 1
+
+def _auto_max_tokens(prompt: str, system: Optional[str]) -> int:
+    used = estimate_tokens(prompt) + (estimate_tokens(system) if system else 0)
+    return max(MIN_AUTO_MAX_TOKENS, min(DEFAULT_MAX_TOKENS, CONTEXT_TOKEN_BUDGET - used - TOKEN_MARGIN))
+
+def _is_quota_error(res: Dict[str, Any]) -> bool:
+    return not res.get("success") and str(res.get("error", "")).startswith("quota_exceeded:")
+
+class DiskResponseCache:
+    """SQLite table of cache key -> serialized result, shared across process restarts."""
+
+    def __init__(self, path: str, ttl: float = DISK_CACHE_TTL):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_responses ("
+            "key BLOB PRIMARY KEY, expires_at REAL NOT NULL, result BLOB NOT NULL) WITHOUT ROWID"
+        )
+        self._conn.execute("DELETE FROM llm_responses WHERE expires_at < ?", (time.time(),))
+
+    def get(self, key: bytes) -> Optional[Dict[str, Any]]:
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT result FROM llm_responses WHERE key = ? AND expires_at >= ?", (key, time.time())
+                ).fetchone()
+        except sqlite3.Error as e:
+            print(f"⚠️ [LLM] Disk cache read failed: {e}")
+            return None
+        return orjson.loads(row[0]) if row else None
+
+    def put(self, key: bytes, result: Dict[str, Any]) -> None:
+        blob = orjson.dumps(result, default=str)
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO llm_responses (key, expires_at, result) VALUES (?, ?, ?)",
+                    (key, time.time() + self.ttl, blob),
+                )
+        except sqlite3.Error as e:
+            print(f"⚠️ [LLM] Disk cache write failed: {e}")
+
+class RateLimiter:
+    """
+    Async token bucket allowing `rate` requests per `period` seconds.
+    Callers over the limit reserve the next free slot and sleep until it, so fan-out is smoothed
+    rather than rejected. Holds no loop-bound primitives, so one instance can serve any event loop.
+    """
+
+    def __init__(self, rate: int, period: float = 60.0):
+        self.capacity = float(rate)
+        self.fill_rate = rate / period
+        self._tokens = self.capacity
+        self._stamp = time.monotonic()
+
+    async def acquire(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._stamp) * self.fill_rate)
+        self._stamp = now
+        self._tokens -= 1
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / self.fill_rate)
 
 class LLMClient:
     """
@@ -38,223 +361,535 @@ class LLMClient:
 
     def __init__(self, default_provider: str = "groq"):
         self.default_provider = LLMProvider(default_provider)
+        env = os.environ  # Read every variable once here; calls reuse the stored values
         self.defaults = {
-            "groq_model": os.getenv("GROQ_DEFAULT_MODEL", "llama-3.3-70b-versatile"),
-            "gemini_model": os.getenv("GEMINI_DEFAULT_MODEL", "gemini-2.0-flash"),
-            "anthropic_model": os.getenv("ANTHROPIC_DEFAULT_MODEL", "claude-3-sonnet-20240229"),
-            "openai_model": os.getenv("OPENAI_DEFAULT_MODEL", "gpt-3.5-turbo"),
+            "groq_model": env.get("GROQ_DEFAULT_MODEL", "llama-3.3-70b-versatile"),
+            "gemini_model": env.get("GEMINI_DEFAULT_MODEL", "gemini-2.0-flash"),
+            "anthropic_model": env.get("ANTHROPIC_DEFAULT_MODEL", "claude-3-sonnet-20240229"),
+            "openai_model": env.get("OPENAI_DEFAULT_MODEL", "gpt-3.5-turbo"),
+        }
+        self._api_keys = {provider: env.get(name) for provider, name in _PROVIDER_KEY_ENV.items()}
+        self._limiters = {
+            provider: RateLimiter(int(env.get(f"{provider.value.upper()}_QPM", qpm)), 60.0)
+            for provider, qpm in _PROVIDER_QPM.items()
         }
+        # LRU of cache key -> (expires_at, result)
+        self._resp_cache: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self._resp_cache_lock = threading.Lock()
+        # Futures for cacheable async requests currently on the wire, keyed by (event loop, cache key)
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+        self._disk_cache: Optional[DiskResponseCache] = None
+        if env.get("LLM_CACHE_DISK", "0") == "1":
+            cache_dir = os.path.expanduser(env.get("LLM_CACHE_DIR", DEFAULT_LLM_CACHE_DIR))
+            try:
+                self._disk_cache = DiskResponseCache(os.path.join(cache_dir, "responses.db"))
+            except (OSError, sqlite3.Error) as e:
+                print(f"⚠️ [LLM] Disk response cache disabled: {e}")
+        # SDK clients reused across calls so their HTTP connection pools are shared
+        self._clients: Dict[tuple, Any] = {}
+        self._groq_llms: Dict[tuple, Any] = {}
+        # Async clients per event loop; an entry goes away with its loop
+        self._loop_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[tuple, Any]]" = weakref.WeakKeyDictionary()
         self._initialize_clients()
 
     def _initialize_clients(self):
         """Initialize provider availability and configure SDKs."""
-        self.groq_ready = bool(os.getenv("GROQ_API_KEY"))
-        self.anthropic_ready = bool(os.getenv("ANTHROPIC_API_KEY"))
-        self.openai_ready = bool(os.getenv("OPENAI_API_KEY"))
-        self.gemini_ready = bool(os.getenv("GOOGLE_API_KEY"))
+        self.groq_ready = bool(self._api_keys[LLMProvider.GROQ])
+        self.anthropic_ready = bool(self._api_keys[LLMProvider.ANTHROPIC])
+        self.openai_ready = bool(self._api_keys[LLMProvider.OPENAI])
+        self.gemini_ready = bool(self._api_keys[LLMProvider.GEMINI])
 
-        # Configure Google Gemini SDK on demand
+        # Google Gemini SDK is imported and configured on first use; only check it is installed here
         self._genai = None
         if self.gemini_ready:
             try:
-                import google.generativeai as genai  # type: ignore
-                genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
-                self._genai = genai
+                self.gemini_ready = importlib.util.find_spec(_PROVIDER_MODULES[LLMProvider.GEMINI]) is not None
             except Exception:
-                self.gemini_ready = False  # disable if import/config fails
+                self.gemini_ready = False  # disable if the SDK is not installed
+
+        # Readiness is fixed once initialized, so resolve the provider list once
+        self._available_providers = tuple(
+            provider.value for provider, ready in (
+                (LLMProvider.GROQ, self.groq_ready),
+                (LLMProvider.ANTHROPIC, self.anthropic_ready),
+                (LLMProvider.OPENAI, self.openai_ready),
+                (LLMProvider.GEMINI, self.gemini_ready),
+            ) if ready
+        )
 
     def get_available_providers(self) -> List[str]:
         """Return the list of providers that have API keys set."""
-        providers = []
-        if self.groq_ready:
-            providers.append(LLMProvider.GROQ.value)
-        if self.anthropic_ready:
-            providers.append(LLMProvider.ANTHROPIC.value)
-        if self.openai_ready:
-            providers.append(LLMProvider.OPENAI.value)
-        if self.gemini_ready:
-            providers.append(LLMProvider.GEMINI.value)
-        return providers
+        return list(self._available_providers)
+
+    def _client(self, provider: LLMProvider, attr: str):
+        """
+        Shared SDK client built from `attr` of the provider module.
+        Async clients are kept per event loop because their connection pools are bound to it.
+        """
+        clients = self._loop_clients.setdefault(asyncio.get_running_loop(), {}) if attr.startswith("Async") else self._clients
+        key = (provider, attr)
+        client = clients.get(key)
+        if client is None:
+            client = getattr(load_provider(provider), attr)(api_key=self._api_keys[provider])
+            clients[key] = client
+        return client
+
+    def _groq_llm(self, model_id: str, temperature: float, max_tokens: int, scope=None,
+                  response_format: Optional[Dict[str, Any]] = None):
+        """
+        ChatGroq for one (model, temperature) pair; `scope` is the event loop for async use.
+        max_tokens and response_format vary per prompt, so they are bound per call rather than baked into the cached instance.
+        """
+        llms = self._groq_llms if scope is None else self._loop_clients.setdefault(scope, {})
+        key = (LLMProvider.GROQ, model_id, temperature)
+        llm = llms.get(key)
+        if llm is None:
+            ChatGroq = load_provider(LLMProvider.GROQ).ChatGroq
+            llm = ChatGroq(model=model_id, temperature=temperature, timeout=30, max_retries=2)
+            llms[key] = llm
+        if response_format:
+            return llm.bind(max_tokens=max_tokens, response_format=_chat_format(response_format))
+        return llm.bind(max_tokens=max_tokens)
 
     # --------------------
     # Provider Implementations
     # --------------------
 
-    def _groq_invoke(self, prompt: str, model: Optional[str], temperature: float, max_tokens: int) -> Dict[str, Any]:
+    def _groq_invoke(self, prompt: str, model: Optional[str], temperature: float, max_tokens: int, system: Optional[str] = None,
+                     stream: bool = False, response_format: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
-        Groq via LangChain ChatGroq: instantiate per call with model=<id>.
+        Groq via LangChain ChatGroq: reuse the instance built for model=<id> and these settings.
         If the model is decommissioned, retry once with a mapped replacement.
+        With stream=True, tokens are accumulated as they arrive and a JSON reply stops at its closing brace.
         """
         if not self.groq_ready:
             return {"success": False, "error": "GROQ_API_KEY not set", "provider": "groq", "model": model}
 
         try:
-            from langchain_groq import ChatGroq  # type: ignore
+            load_provider(LLMProvider.GROQ)
         except Exception as e:
             return {"success": False, "error": f"ChatGroq import error: {e}", "provider": "groq", "model": model}
 
         model_id = model or self.defaults["groq_model"]
-        llm = ChatGroq(model=model_id, temperature=temperature, max_tokens=max_tokens, timeout=30, max_retries=2)
+        llm = self._groq_llm(model_id, temperature, max_tokens, response_format=response_format)
+        messages = _chat_messages(prompt, system)
+        stream = stream and not response_format  # Groq JSON mode does not support streaming
         try:
-            resp = llm.invoke([("human", prompt)])
-            return {
-                "success": True,
-                "response": resp.content,
-                "provider": "groq",
-                "model": model_id,
-                "metadata": {
-                    "usage": getattr(resp, "usage_metadata", None),
-                    "reasoning": getattr(resp, "additional_kwargs", {}).get("reasoning_content"),
-                },
-            }
+            return _groq_result(_groq_stream(llm, messages) if stream else llm.invoke(messages), model_id)
         except Exception as e:
-            msg = str(e)
             # Handle Groq decommissioned models by retrying once with recommended replacement
-            if "decommissioned" in msg or "model_decommissioned" in msg:
+            if _is_groq_decommissioned(e):
                 replacement = GROQ_MODEL_REPLACEMENTS.get(model_id)
                 if replacement:
                     try:
-                        llm2 = ChatGroq(model=replacement, temperature=temperature, max_tokens=max_tokens, timeout=30, max_retries=2)
-                        resp2 = llm2.invoke([("human", prompt)])
-                        return {
-                            "success": True,
-                            "response": resp2.content,
-                            "provider": "groq",
-                            "model": replacement,
-                            "metadata": {
-                                "usage": getattr(resp2, "usage_metadata", None),
-                                "reasoning": getattr(resp2, "additional_kwargs", {}).get("reasoning_content"),
-                                "fallback_from": model_id,
-                            },
-                        }
+                        llm2 = self._groq_llm(replacement, temperature, max_tokens, response_format=response_format)
+                        resp2 = _groq_stream(llm2, messages) if stream else llm2.invoke(messages)
+                        return _groq_result(resp2, replacement, fallback_from=model_id)
                     except Exception as e2:
                         return {"success": False, "error": f"Groq fallback failed: {e2}", "provider": "groq", "model": replacement}
             return {"success": False, "error": f"{e}", "provider": "groq", "model": model_id}
 
-    def _generate_gemini(self, prompt: str, model: Optional[str], temperature: float, max_tokens: int) -> Dict[str, Any]:
+    def _generate_gemini(self, prompt: str, model: Optional[str], temperature: float, max_tokens: int, system: Optional[str] = None,
+                         response_format: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Google Gemini via google-generativeai.
         Default model: gemini-2.0-flash; on 429 quota exceeded, return structured error and let caller decide fallback/backoff.
         """
-        if not self.gemini_ready or self._genai is None:
+        if not self._gemini_sdk():
             return {"success": False, "error": "GOOGLE_API_KEY not set or SDK not available", "provider": "gemini", "model": model}
 
         mdl = model or self.defaults["gemini_model"]
-        generation_config = {"temperature": temperature, "max_output_tokens": max_tokens}
+        generation_config = _gemini_config(temperature, max_tokens, response_format)
         try:
-            gm = self._genai.GenerativeModel(mdl)
+            gm = self._genai.GenerativeModel(mdl, system_instruction=system)
             resp = gm.generate_content(prompt, generation_config=generation_config)
             return {"success": True, "response": resp.text, "provider": "gemini", "model": mdl, "metadata": {}}
         except Exception as e:
-            msg = str(e)
-            if "429" in msg or "quota" in msg.lower():
-                return {
-                    "success": False,
-                    "error": f"quota_exceeded:{e}",
-                    "provider": "gemini",
-                    "model": mdl,
-                    "metadata": {"hint": "Retry with server-provided delay or fallback to another provider"},
-                }
-            return {"success": False, "error": f"{e}", "provider": "gemini", "model": mdl}
+            return _gemini_error(e, mdl)
+
+    def _gemini_sdk(self) -> bool:
+        """Import and configure the Gemini SDK on first use; return whether it is usable."""
+        if self.gemini_ready and self._genai is None:
+            try:
+                genai = load_provider(LLMProvider.GEMINI)
+                genai.configure(api_key=self._api_keys[LLMProvider.GEMINI])
+                self._genai = genai
+            except Exception:
+                self.gemini_ready = False  # disable if import/config fails
+        return self.gemini_ready and self._genai is not None
 
-    def _generate_anthropic(self, prompt: str, model: Optional[str], temperature: float, max_tokens: int) -> Dict[str, Any]:
+    def _generate_anthropic(self, prompt: str, model: Optional[str], temperature: float, max_tokens: int, system: Optional[str] = None) -> Dict[str, Any]:
         """Anthropic Claude messages API."""
         if not self.anthropic_ready:
             return {"success": False, "error": "ANTHROPIC_API_KEY not set", "provider": "anthropic", "model": model}
         try:
-            import anthropic  # type: ignore
-            client = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+            client = self._client(LLMProvider.ANTHROPIC, "Anthropic")
             mdl = model or self.defaults["anthropic_model"]
             resp = client.messages.create(
                 model=mdl,
                 max_tokens=max_tokens,
                 temperature=temperature,
                 messages=[{"role": "user", "content": prompt}],
+                **_anthropic_system(system),
             )
-            text = resp.content.text if getattr(resp, "content", None) else ""
-            usage = {"input_tokens": getattr(resp, "usage", {}).get("input_tokens", None),
-                     "output_tokens": getattr(resp, "usage", {}).get("output_tokens", None)}
-            return {"success": True, "response": text, "provider": "anthropic", "model": mdl, "metadata": {"usage": usage}}
+            return _anthropic_result(resp, mdl)
         except Exception as e:
             return {"success": False, "error": f"{e}", "provider": "anthropic", "model": model}
 
-    def _generate_openai(self, prompt: str, model: Optional[str], temperature: float, max_tokens: int) -> Dict[str, Any]:
+    def _generate_openai(self, prompt: str, model: Optional[str], temperature: float, max_tokens: int, system: Optional[str] = None,
+                         response_format: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """OpenAI Chat Completions API."""
         if not self.openai_ready:
             return {"success": False, "error": "OPENAI_API_KEY not set", "provider": "openai", "model": model}
         try:
-            from openai import OpenAI  # type: ignore
-            client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+            client = self._client(LLMProvider.OPENAI, "OpenAI")
             mdl = model or self.defaults["openai_model"]
             resp = client.chat.completions.create(
                 model=mdl,
+                messages=_chat_messages(prompt, system, roles=("system", "user"), as_dicts=True),
+                temperature=temperature,
+                max_tokens=max_tokens,
+                **({"response_format": _chat_format(response_format)} if response_format else {}),
+            )
+            return _openai_result(resp, mdl)
+        except Exception as e:
+            return {"success": False, "error": f"{e}", "provider": "openai", "model": model}
+
+    # --------------------
+    # Async Provider Implementations
+    # --------------------
+
+    async def _agroq_invoke(self, prompt: str, model: Optional[str], temperature: float, max_tokens: int, system: Optional[str] = None,
+                           stream: bool = False, response_format: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Async twin of _groq_invoke using ChatGroq.ainvoke / astream."""
+        if not self.groq_ready:
+            return {"success": False, "error": "GROQ_API_KEY not set", "provider": "groq", "model": model}
+
+        try:
+            load_provider(LLMProvider.GROQ)
+        except Exception as e:
+            return {"success": False, "error": f"ChatGroq import error: {e}", "provider": "groq", "model": model}
+
+        model_id = model or self.defaults["groq_model"]
+        loop = asyncio.get_running_loop()
+        llm = self._groq_llm(model_id, temperature, max_tokens, loop, response_format)
+        messages = _chat_messages(prompt, system)
+        stream = stream and not response_format  # Groq JSON mode does not support streaming
+        try:
+            return _groq_result(await (_agroq_stream(llm, messages) if stream else llm.ainvoke(messages)), model_id)
+        except Exception as e:
+            if _is_groq_decommissioned(e):
+                replacement = GROQ_MODEL_REPLACEMENTS.get(model_id)
+                if replacement:
+                    try:
+                        llm2 = self._groq_llm(replacement, temperature, max_tokens, loop, response_format)
+                        resp2 = await (_agroq_stream(llm2, messages) if stream else llm2.ainvoke(messages))
+                        return _groq_result(resp2, replacement, fallback_from=model_id)
+                    except Exception as e2:
+                        return {"success": False, "error": f"Groq fallback failed: {e2}", "provider": "groq", "model": replacement}
+            return {"success": False, "error": f"{e}", "provider": "groq", "model": model_id}
+
+    async def _agenerate_gemini(self, prompt: str, model: Optional[str], temperature: float, max_tokens: int, system: Optional[str] = None,
+                                response_format: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Async twin of _generate_gemini using generate_content_async."""
+        if not self._gemini_sdk():
+            return {"success": False, "error": "GOOGLE_API_KEY not set or SDK not available", "provider": "gemini", "model": model}
+
+        mdl = model or self.defaults["gemini_model"]
+        generation_config = _gemini_config(temperature, max_tokens, response_format)
+        try:
+            gm = self._genai.GenerativeModel(mdl, system_instruction=system)
+            resp = await gm.generate_content_async(prompt, generation_config=generation_config)
+            return {"success": True, "response": resp.text, "provider": "gemini", "model": mdl, "metadata": {}}
+        except Exception as e:
+            return _gemini_error(e, mdl)
+
+    async def _agenerate_anthropic(self, prompt: str, model: Optional[str], temperature: float, max_tokens: int, system: Optional[str] = None) -> Dict[str, Any]:
+        """Async twin of _generate_anthropic using AsyncAnthropic."""
+        if not self.anthropic_ready:
+            return {"success": False, "error": "ANTHROPIC_API_KEY not set", "provider": "anthropic", "model": model}
+        try:
+            client = self._client(LLMProvider.ANTHROPIC, "AsyncAnthropic")
+            mdl = model or self.defaults["anthropic_model"]
+            resp = await client.messages.create(
+                model=mdl,
+                max_tokens=max_tokens,
+                temperature=temperature,
                 messages=[{"role": "user", "content": prompt}],
+                **_anthropic_system(system),
+            )
+            return _anthropic_result(resp, mdl)
+        except Exception as e:
+            return {"success": False, "error": f"{e}", "provider": "anthropic", "model": model}
+
+    async def _agenerate_openai(self, prompt: str, model: Optional[str], temperature: float, max_tokens: int, system: Optional[str] = None,
+                                response_format: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Async twin of _generate_openai using AsyncOpenAI."""
+        if not self.openai_ready:
+            return {"success": False, "error": "OPENAI_API_KEY not set", "provider": "openai", "model": model}
+        try:
+            client = self._client(LLMProvider.OPENAI, "AsyncOpenAI")
+            mdl = model or self.defaults["openai_model"]
+            resp = await client.chat.completions.create(
+                model=mdl,
+                messages=_chat_messages(prompt, system, roles=("system", "user"), as_dicts=True),
                 temperature=temperature,
                 max_tokens=max_tokens,
+                **({"response_format": _chat_format(response_format)} if response_format else {}),
             )
-            usage = {"prompt_tokens": resp.usage.prompt_tokens, "completion_tokens": resp.usage.completion_tokens, "total_tokens": resp.usage.total_tokens}
-            return {"success": True, "response": resp.choices.message.content, "provider": "openai", "model": mdl, "metadata": {"usage": usage}}
+            return _openai_result(resp, mdl)
         except Exception as e:
             return {"success": False, "error": f"{e}", "provider": "openai", "model": model}
 
+    # --------------------
+    # Response Cache
+    # --------------------
+
+    def _cache_key(self, prov: LLMProvider, model: Optional[str], prompt: str,
+                   temperature: float, max_tokens: int, system: Optional[str] = None,
+                   response_format: Optional[Dict[str, Any]] = None) -> Optional[bytes]:
+        """Key for an exact-match cache lookup, or None when the call is too random to cache."""
+        if temperature > CACHEABLE_MAX_TEMPERATURE:
+            return None
+        model_id = model or self.defaults.get(f"{prov.value}_model", "")
+        fmt = response_format.get("type", "") if response_format else ""
+        raw = f"{prov.value}|{model_id}|{temperature}|{max_tokens}|{fmt}|{system or ''}|{prompt}"
+        return hashlib.blake2b(raw.encode(), digest_size=16).digest()
+
+    def _cache_get(self, key: Optional[bytes]) -> Optional[Dict[str, Any]]:
+        """Look up memory first, then disk; disk hits are promoted into memory."""
+        if key is None:
+            return None
+        hit = None
+        with self._resp_cache_lock:
+            entry = self._resp_cache.get(key)
+            if entry is not None:
+                if entry[0] < time.monotonic():
+                    del self._resp_cache[key]
+                else:
+                    self._resp_cache.move_to_end(key)
+                    hit = entry[1]
+        if hit is None and self._disk_cache is not None:
+            hit = self._disk_cache.get(key)
+            if hit is not None:
+                self._memory_put(key, hit)
+        if hit is None:
+            return None
+        return {**hit, "metadata": {**(hit.get("metadata") or {}), "cache": "hit"}}
+
+    def _cache_put(self, key: Optional[bytes], result: Dict[str, Any]) -> None:
+        if key is None or not result.get("success"):
+            return
+        self._memory_put(key, result)
+        if self._disk_cache is not None:
+            self._disk_cache.put(key, result)
+
+    def _memory_put(self, key: bytes, result: Dict[str, Any]) -> None:
+        with self._resp_cache_lock:
+            self._resp_cache[key] = (time.monotonic() + RESPONSE_CACHE_TTL, result)
+            self._resp_cache.move_to_end(key)
+            while len(self._resp_cache) > RESPONSE_CACHE_MAX_SIZE:
+                self._resp_cache.popitem(last=False)
+
     # --------------------
     # Public API
     # --------------------
 
     def generate_response(self, prompt: str, provider: Optional[str] = None,
                           model: Optional[str] = None, temperature: float = 0.1,
-                          max_tokens: int = 2048) -> Dict[str, Any]:
+                          max_tokens: Optional[int] = None, system: Optional[str] = None,
+                          stream: bool = False, response_format: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Generate a response using the selected provider.
+        `system` carries static instructions kept apart from the prompt so providers can cache them.
+        `stream` makes Groq stream the reply and stop as soon as a JSON object is complete; it is meant
+        for prompts that ask for JSON in text and is ignored with response_format (Groq JSON mode cannot stream).
+        `response_format` ({"type": "json_object"}, optionally with a Gemini "schema") forces JSON output
+        on Groq, OpenAI and Gemini; Anthropic has no JSON mode and relies on the prompt.
+        Without max_tokens, the output budget is sized from the prompt length (see _auto_max_tokens).
+        Low-temperature calls are served from the exact-match response cache when possible.
         Optional behavior: if Gemini returns quota_exceeded, try Groq as a fallback when available.
         """
         prov = LLMProvider(provider or self.default_provider.value)
-
+        if max_tokens is None:
+            max_tokens = _auto_max_tokens(prompt, system)
+        key = self._cache_key(prov, model, prompt, temperature, max_tokens, system, response_format)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        res = self._dispatch(prov, prompt, model, temperature, max_tokens, system, stream, response_format)
+        self._cache_put(key, res)
+        return dict(res)  # the cache keeps `res`; callers get their own copy
+
+    def _dispatch(self, prov: LLMProvider, prompt: str, model: Optional[str],
+                  temperature: float, max_tokens: int, system: Optional[str] = None,
+                  stream: bool = False, response_format: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         if prov == LLMProvider.GROQ:
-            return self._groq_invoke(prompt, model, temperature, max_tokens)
+            return self._groq_invoke(prompt, model, temperature, max_tokens, system, stream, response_format)
 
         if prov == LLMProvider.GEMINI:
-            res = self._generate_gemini(prompt, model, temperature, max_tokens)
+            res = self._generate_gemini(prompt, model, temperature, max_tokens, system, response_format)
             # Optional fallback: if Gemini quota is exceeded and Groq is ready, retry on Groq
-            if not res.get("success") and str(res.get("error", "")).startswith("quota_exceeded:") and self.groq_ready:
-                return self._groq_invoke(prompt, None, temperature, max_tokens)
+            if _is_quota_error(res) and self.groq_ready:
+                return self._groq_invoke(prompt, None, temperature, max_tokens, system, stream, response_format)
             return res
 
         if prov == LLMProvider.ANTHROPIC:
-            return self._generate_anthropic(prompt, model, temperature, max_tokens)
+            return self._generate_anthropic(prompt, model, temperature, max_tokens, system)
 
         if prov == LLMProvider.OPENAI:
-            return self._generate_openai(prompt, model, temperature, max_tokens)
+            return self._generate_openai(prompt, model, temperature, max_tokens, system, response_format)
 
         return {"success": False, "error": f"Provider {prov.value} not supported", "provider": prov.value, "model": model}
 
-    def analyze_error_context(self, error_message: str, step: str, context: Dict[str, Any]) -> Dict[str, Any]:
+    async def agenerate_response(self, prompt: str, provider: Optional[str] = None,
+                                 model: Optional[str] = None, temperature: float = 0.1,
+                                 max_tokens: Optional[int] = None, system: Optional[str] = None,
+                                 hedge: bool = False, stream: bool = False,
+                                 response_format: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
-        Use the default provider to analyze an automation error and suggest solutions.
-        Returns parsed JSON when possible; otherwise includes the raw response.
+        Async generate_response; same cache, provider selection and Gemini-to-Groq fallback.
+        With hedge=True, Groq is raced against a slow primary instead of waiting for it to fail.
+        Concurrent identical cacheable calls share one request instead of each hitting the provider.
         """
-        prompt = f"""
-You are an expert mobile automation assistant. Analyze this automation error and provide suggestions.
+        prov = LLMProvider(provider or self.default_provider.value)
+        if max_tokens is None:
+            max_tokens = _auto_max_tokens(prompt, system)
+        key = self._cache_key(prov, model, prompt, temperature, max_tokens, system, response_format)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+        if key is None:
+            return await self._agenerate_uncached(prov, prompt, model, temperature, max_tokens, system, hedge, stream,
+                                                   response_format)
+
+        loop = asyncio.get_running_loop()
+        while (waiter := self._inflight.get((loop, key))) is not None:
+            try:
+                return dict(await asyncio.shield(waiter))
+            except asyncio.CancelledError:
+                if not waiter.cancelled():
+                    raise  # this caller was cancelled, not the shared request
+                # The leader was cancelled; send the request ourselves unless another waiter already has
 
-Error Context:
-- Step: {step}
-- Error: {error_message}
-- Context: {json.dumps(context, indent=2)}
+        fut = self._inflight[(loop, key)] = loop.create_future()
+        try:
+            res = await self._agenerate_uncached(prov, prompt, model, temperature, max_tokens, system, hedge, stream,
+                                                 response_format)
+        except asyncio.CancelledError:
+            fut.cancel()
+            raise
+        except Exception as e:
+            fut.set_exception(e)
+            fut.exception()  # waiters re-raise it; don't log it as unretrieved when there are none
+            raise
+        else:
+            self._cache_put(key, res)
+            fut.set_result(res)
+            return dict(res)
+        finally:
+            self._inflight.pop((loop, key), None)
+
+    async def _agenerate_uncached(self, prov: LLMProvider, prompt: str, model: Optional[str],
+                                  temperature: float, max_tokens: int, system: Optional[str],
+                                  hedge: bool, stream: bool,
+                                  response_format: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        if hedge and prov != LLMProvider.GROQ and self.groq_ready:
+            return await self.agenerate_with_hedge(prompt, prov.value, LLMProvider.GROQ.value, model=model,
+                                                   temperature=temperature, max_tokens=max_tokens, system=system,
+                                                   stream=stream, response_format=response_format)
+        return await self._adispatch(prov, prompt, model, temperature, max_tokens, system, stream, response_format)
+
+    async def agenerate_with_hedge(self, prompt: str, primary: str = "gemini", backup: str = "groq",
+                                   hedge_delay: float = HEDGE_DELAY, model: Optional[str] = None,
+                                   temperature: float = 0.1, max_tokens: int = 2048,
+                                   system: Optional[str] = None, stream: bool = False,
+                                   response_format: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Start `primary`; if it fails or has not answered within `hedge_delay` seconds, start `backup` too.
+        The first successful response wins and the other request is cancelled.
+        `model` applies to the primary only; the backup uses its default model.
+        """
+        first = asyncio.create_task(self._acall(LLMProvider(primary), prompt, model, temperature, max_tokens, system, stream,
+                                                response_format))
+        tasks = [first]
+        try:
+            done, pending = await asyncio.wait({first}, timeout=hedge_delay)
+            res = first.result() if done else None
+            if res is not None and res.get("success"):
+                return res
+
+            tasks.append(asyncio.create_task(self._acall(LLMProvider(backup), prompt, None, temperature, max_tokens, system,
+                                                         stream, response_format)))
+            pending.add(tasks[-1])
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    res = task.result()
+                    if res.get("success"):
+                        return res
+            return res
+        finally:
+            # Also covers the caller being cancelled or timing out and a provider raising
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def _adispatch(self, prov: LLMProvider, prompt: str, model: Optional[str],
+                         temperature: float, max_tokens: int, system: Optional[str] = None,
+                         stream: bool = False, response_format: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        res = await self._acall(prov, prompt, model, temperature, max_tokens, system, stream, response_format)
+        if prov == LLMProvider.GEMINI and _is_quota_error(res) and self.groq_ready:
+            return await self._acall(LLMProvider.GROQ, prompt, None, temperature, max_tokens, system, stream, response_format)
+        return res
+
+    async def _acall(self, prov: LLMProvider, prompt: str, model: Optional[str],
+                     temperature: float, max_tokens: int, system: Optional[str] = None,
+                     stream: bool = False, response_format: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """One async provider call, without fallback, paced by the provider's rate limiter."""
+        limiter = self._limiters.get(prov)
+        if limiter is not None:
+            await limiter.acquire()
 
-Please provide:
-1. Likely cause of the error
-2. Suggested solution/retry strategy
-3. Alternative approaches
-4. Whether this is a critical failure or can be skipped
+        if prov == LLMProvider.GROQ:
+            return await self._agroq_invoke(prompt, model, temperature, max_tokens, system, stream, response_format)
 
-Respond in JSON with keys: cause, solution, alternatives, critical
-""".strip()
-        res = self.generate_response(prompt)
+        if prov == LLMProvider.GEMINI:
+            return await self._agenerate_gemini(prompt, model, temperature, max_tokens, system, response_format)
+
+        if prov == LLMProvider.ANTHROPIC:
+            return await self._agenerate_anthropic(prompt, model, temperature, max_tokens, system)
+
+        if prov == LLMProvider.OPENAI:
+            return await self._agenerate_openai(prompt, model, temperature, max_tokens, system, response_format)
+
+        return {"success": False, "error": f"Provider {prov.value} not supported", "provider": prov.value, "model": model}
+
+    async def agenerate_batch(self, prompts: List[str], provider: Optional[str] = None,
+                              concurrency: int = 50, **kwargs) -> List[Dict[str, Any]]:
+        """Run many prompts concurrently, at most `concurrency` in flight; results keep prompt order."""
+        sem = asyncio.Semaphore(concurrency)
+
+        async def one(prompt: str) -> Dict[str, Any]:
+            async with sem:
+                return await self.agenerate_response(prompt, provider, **kwargs)
+
+        return await asyncio.gather(*(one(p) for p in prompts))
+
+    def analyze_error_context(self, error_message: str, step: str, context: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Use the default provider to analyze an automation error and suggest solutions.
+        JSON output is forced where the provider supports it; Anthropic replies that are
+        not valid JSON still fall back to wrapping the raw response.
+        """
+        system, prompt = self._error_analysis_prompt(error_message, step, context)
+        res = self.generate_response(prompt, max_tokens=ERROR_ANALYSIS_MAX_TOKENS, system=system,
+                                     response_format=ERROR_ANALYSIS_FORMAT)
         if res.get("success"):
             try:
                 analysis = json.loads(res["response"])
                 return {"success": True, "analysis": analysis, "raw_response": res["response"], "provider": res.get("provider"), "model": res.get("model")}
-            except Exception:
+            except ValueError:
                 return {
                     "success": True,
                     "analysis": {"cause": "Unknown", "solution": res["response"], "alternatives": [], "critical": True},
@@ -268,33 +903,55 @@ Respond in JSON with keys: cause, solution, alternatives, critical
         """
         Generate step-by-step automation instructions for the given task and context.
         """
-        prompt = f"""
-You are a mobile automation expert. Generate step-by-step instructions for this task:
-
-Task: {task}
-Context: {json.dumps(context, indent=2)}
+        system, prompt = self._instructions_prompt(task, context)
+        return self.generate_response(prompt, max_tokens=AUTOMATION_INSTRUCTIONS_MAX_TOKENS, system=system)
 
-Provide detailed steps that can be executed by an automation framework.
-Consider element selectors, timing, backoff, and robust error handling.
-
-Respond with a structured plan.
+    @staticmethod
+    def _error_analysis_prompt(error_message: str, step: str, context: Dict[str, Any]) -> Tuple[str, str]:
+        """(system, user) pair: the fixed instructions, then only the per-error details."""
+        user = f"""
+Error Context:
+- Step: {step}
+- Error: {error_message}
+- Context: {_dump_context(context)}
 """.strip()
-        return self.generate_response(prompt)
+        return ERROR_ANALYSIS_SYSTEM, user
 
-# Singleton helpers
-_llm_client_singleton = None
+    @staticmethod
+    def _instructions_prompt(task: str, context: Dict[str, Any]) -> Tuple[str, str]:
+        """(system, user) pair: the fixed instructions, then only the task and context."""
+        user = f"""
+Task: {task}
+Context: {_dump_context(context)}
+""".strip()
+        return AUTOMATION_INSTRUCTIONS_SYSTEM, user
 
+# Singleton helpers: one client per default provider, built on first use
+@lru_cache(maxsize=None)
 def get_llm_client(provider: str = "gemini") -> LLMClient:
-    global _llm_client_singleton
-    if _llm_client_singleton is None:
-        _llm_client_singleton = LLMClient(default_provider=provider)
-    return _llm_client_singleton
+    return LLMClient(default_provider=provider)
 
-def test_llm_providers() -> Dict[str, Any]:
+# Per-provider budget for the connectivity test
+PROVIDER_TEST_TIMEOUT = 15.0
+
+async def atest_llm_providers(timeout: float = PROVIDER_TEST_TIMEOUT) -> Dict[str, Any]:
+    """Query every available provider at once; total time is the slowest provider, capped at `timeout`."""
     client = get_llm_client()
     prompt = "Explain mobile app automation in one sentence."
-    results = {}
-    for prov in client.get_available_providers():
-        res = client.generate_response(prompt, provider=prov, temperature=0.1, max_tokens=128)
-        results[prov] = res
-    return results
+    providers = client.get_available_providers()
+    results = await asyncio.gather(*(
+        asyncio.wait_for(client.agenerate_response(prompt, provider=prov, temperature=0.1, max_tokens=128), timeout)
+        for prov in providers
+    ), return_exceptions=True)
+    return {
+        prov: res if isinstance(res, dict) else {
+            "success": False,
+            "error": f"timed out after {timeout:g}s" if isinstance(res, asyncio.TimeoutError) else f"{res}",
+            "provider": prov,
+            "model": None,
+        }
+        for prov, res in zip(providers, results)
+    }
+
+def test_llm_providers() -> Dict[str, Any]:
+    return asyncio.run(atest_llm_providers())
@@ -7,11 +7,12 @@ Enhanced mobile automation with LLM-driven tool orchestration, OCR capabilities,
 import argparse
 import sys
 import os
-import uuid
+import time
 import traceback
 from typing import Dict, Any
-from datetime import datetime
+from datetime import datetime, date
 from backend.settings import agent_settings
+from backend.db import generate_process_id
 
 # Add project root to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -92,11 +93,12 @@ def run_manual_automation(args) -> Dict[str, Any]:
         print(f"🏗️ [MANUAL] Provider: {args.llm_provider}")
 
         # Generate process ID
-        process_id = f"manual_{uuid.uuid4().hex[:8]}"
+        process_id = generate_process_id("manual")
         print(f"🔍 [MANUAL] Process ID: {process_id}")
 
         # Log start time
         start_time = datetime.now()
+        start_clock = time.monotonic()
         print(f"⏰ [MANUAL] Start time: {start_time.strftime('%H:%M:%S')}")
 
         print("\n🚀 [MANUAL] Beginning agentic automation workflow...")
@@ -116,7 +118,7 @@ def run_manual_automation(args) -> Dict[str, Any]:
 
         # Log completion
         end_time = datetime.now()
-        duration = (end_time - start_time).total_seconds()
+        duration = time.monotonic() - start_clock
 
         print(f"\n⏰ [MANUAL] End time: {end_time.strftime('%H:%M:%S')}")
         print(f"⏱️ [MANUAL] Total duration: {duration:.1f} seconds")
@@ -379,9 +381,9 @@ def print_results(results: Dict[str, Any]):
         print(f"   {results['error_message']}")
 
     # Recent tool calls summary
-    if results.get("recent_tool_calls"):
+    if results.get("tool_calls"):
         print(f"\n🔧 Recent Tool Activity:")
-        for i, call in enumerate(results["recent_tool_calls"][-5:], 1):
+        for i, call in enumerate(results["tool_calls"][-5:], 1):
             tool_name = call.get("tool_name", "unknown")
             action = call.get("action", "unknown")
             call_success = call.get("success", False)
@@ -502,9 +504,12 @@ Examples:
             print("💡 Example: python main.py --mode manual --first-name John --last-name Smith --date-of-birth 1995-05-15")
             return 1
 
-        # Validate date format
+        # Validate date format: fixed-shape check, then the C ISO parser rejects impossible dates
         try:
-            datetime.strptime(args.date_of_birth, "%Y-%m-%d")
+            dob = args.date_of_birth
+            if len(dob) != 10 or dob[4] != "-" or dob[7] != "-":
+                raise ValueError(dob)
+            date.fromisoformat(dob)
         except ValueError:
             print("❌ Error: --date-of-birth must be in YYYY-MM-DD format")
             print("💡 Example: --date-of-birth 1995-05-15")
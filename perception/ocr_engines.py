@@ -7,9 +7,23 @@ Supports Tesseract, PaddleOCR, and EasyOCR with unified interface
 import numpy as np
 from typing import Dict, Any, List, Tuple, Optional, Union
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 import hashlib
+import threading
 import time
 
+from backend.settings import ocr_settings
+
+def content_hash(data) -> str:
+    """128-bit blake2b hex digest of bytes or any buffer (faster than md5)."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+def image_hash(image: np.ndarray) -> str:
+    """Content hash of an image array, hashed in place without tobytes() copy."""
+    h = hashlib.blake2b(np.ascontiguousarray(image).data, digest_size=16)
+    h.update(repr(image.shape).encode())
+    return h.hexdigest()
+
 class OCRResult:
     """Unified OCR result container."""
 
@@ -299,8 +313,8 @@ class OCREngineManager:
 
     def __init__(self):
         self.engines = []
-        self.cache = {}  # Simple in-memory cache
-        self.cache_max_size = 50
+        self.cache = OrderedDict()  # LRU keyed by image content hash
+        self.cache_max_size = ocr_settings.cache_max_size
 
         # Initialize engines in priority order
         self._init_engines()
@@ -337,10 +351,12 @@ class OCREngineManager:
             return OCRResult(text="", confidence=0.0, engine="none")
 
         # Generate cache key
-        image_hash = hashlib.md5(image.tobytes()).hexdigest()[:16]
-        if image_hash in self.cache:
-            print(f"⚡ [OCR] Cache hit for image {image_hash}")
-            return self.cache[image_hash]
+        key = image_hash(image)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.cache.move_to_end(key)
+            print(f"⚡ [OCR] Cache hit for image {key[:16]}")
+            return cached
 
         best_result = None
 
@@ -351,7 +367,7 @@ class OCREngineManager:
             # Use this result if it's good enough
             if result.confidence >= min_confidence and result.text.strip():
                 print(f"✅ [OCR] Satisfied with {engine.get_name()} result (confidence: {result.confidence:.2f})")
-                self._cache_result(image_hash, result)
+                self._cache_result(key, result)
                 return result
 
             # Keep track of best result so far
@@ -361,7 +377,7 @@ class OCREngineManager:
         # Return best result even if below confidence threshold
         if best_result:
             print(f"🔄 [OCR] Using best result from {best_result.engine} (confidence: {best_result.confidence:.2f})")
-            self._cache_result(image_hash, best_result)
+            self._cache_result(key, best_result)
             return best_result
         else:
             empty_result = OCRResult(text="", confidence=0.0, engine="failed")
@@ -379,12 +395,10 @@ class OCREngineManager:
 
     def _cache_result(self, key: str, result: OCRResult):
         """Cache OCR result with LRU eviction."""
-        if len(self.cache) >= self.cache_max_size:
-            # Simple LRU: remove oldest entry
-            oldest_key = next(iter(self.cache))
-            del self.cache[oldest_key]
-
         self.cache[key] = result
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.cache_max_size:
+            self.cache.popitem(last=False)
 
     def get_available_engines(self) -> List[str]:
         """Get list of available engine names."""
@@ -397,10 +411,13 @@ class OCREngineManager:
 
 # Global OCR manager instance
 _ocr_manager = None
+_ocr_manager_lock = threading.Lock()
 
 def get_ocr_manager() -> OCREngineManager:
-    """Get the global OCR manager instance."""
+    """Get the global OCR manager instance (engines are loaded once, even under concurrent first calls)."""
     global _ocr_manager
     if _ocr_manager is None:
-        _ocr_manager = OCREngineManager()
+        with _ocr_manager_lock:
+            if _ocr_manager is None:
+                _ocr_manager = OCREngineManager()
     return _ocr_manager
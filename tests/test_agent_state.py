@@ -0,0 +1,29 @@
+# test_agent_state.py
+"""State helpers in agent.state"""
+
+from langchain_core.messages import AIMessage
+
+from agent.state import WorkflowStep, add_tool_call_record, create_initial_state, get_state_summary, set_current_step
+
+
+def make_state():
+    return create_initial_state("proc_1", "Ana", "Lopez", "1995-01-15", use_llm=False)
+
+
+def test_summary_carries_tool_calls_and_messages():
+    state = make_state()
+    add_tool_call_record(state, "mobile_ui", "click", {"locator": "x"}, {"content": "clicked"}, 12, True)
+    add_tool_call_record(state, "ocr", "read", {}, {"content": "failed"}, 30, False)
+    state["messages"].append(AIMessage(content="click", tool_calls=[{"name": "mobile_ui", "args": {}, "id": "c1"}]))
+    set_current_step(state, WorkflowStep.EMAIL, 15)
+
+    summary = get_state_summary(state)
+
+    assert summary["current_step"] == "email"
+    assert summary["tool_calls_made"] == 2
+    assert [c["tool_name"] for c in summary["tool_calls"]] == ["mobile_ui", "ocr"]
+    assert summary["tool_calls"][1]["success"] is False
+    assert summary["recent_tool_activity"][-1] == "❌ ocr.read (30ms)"
+    assert summary["messages"] == [
+        {"type": "ai", "content": "click", "tool_calls": [{"name": "mobile_ui", "args": {}, "id": "c1", "type": "tool_call"}]}
+    ]
@@ -0,0 +1,153 @@
+# test_backend_state.py
+"""In-memory automation tracking in backend.main"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from backend import main
+
+
+@pytest.fixture(autouse=True)
+def clean_registry(monkeypatch):
+    monkeypatch.setattr(main, "active_automations", main.OrderedDict())
+    monkeypatch.setattr(main, "status_counts", main.Counter())
+    yield
+
+
+def make_run(process_id, status="running", finished=False):
+    return {"process_id": process_id, "status": status, "finished": finished}
+
+
+def test_cancelled_run_is_not_evicted_while_workflow_executes(monkeypatch):
+    monkeypatch.setattr(main, "settings", {**main.settings, "api": SimpleNamespace(max_active=1)})
+
+    cancelled = make_run("a")
+    main.register_automation("a", cancelled)
+    main.set_status(cancelled, "cancelled")
+    main.register_automation("b", make_run("b"))
+
+    assert "a" in main.active_automations
+
+    # The workflow returning later still keeps the counters consistent
+    main.set_status(cancelled, "failed")
+    cancelled["finished"] = True
+    main.register_automation("c", make_run("c"))
+
+    assert "a" not in main.active_automations
+    assert all(count >= 0 for count in main.status_counts.values())
+    assert main.status_counts["running"] == 2
+
+
+def test_set_status_on_evicted_run_leaves_counts_alone():
+    run = make_run("a", status="completed", finished=True)
+    main.set_status(run, "failed")
+
+    assert run["status"] == "failed"
+    assert not +main.status_counts
+
+
+@pytest.fixture
+def api(monkeypatch, tmp_path):
+    from fastapi.testclient import TestClient
+    from backend.db import DatabaseManager, get_database
+
+    db = DatabaseManager(f"sqlite:///{tmp_path / 'runs.db'}")
+    main.app.dependency_overrides[get_database] = lambda: db
+
+    async def no_workflow(*args):
+        pass
+
+    monkeypatch.setattr(main, "run_automation_workflow", no_workflow)
+    yield TestClient(main.app), db
+    main.app.dependency_overrides.clear()
+    db.close()
+
+
+def test_start_returns_valid_response_and_records_run(api):
+    client, db = api
+    response = client.post("/api/v2/automation/start", json={
+        "first_name": "Ana", "last_name": "Lopez", "date_of_birth": "1995-01-15", "use_llm": False
+    })
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "running"
+    assert body["current_step"] == "init"
+    assert db.get_automation_run(body["process_id"])["status"] == "running"
+
+    status = client.get(f"/api/v2/automation/{body['process_id']}/status")
+    assert status.status_code == 200
+    assert status.json()["current_step"] == "init"
+
+
+
+def test_workflow_result_fills_history_and_trace(monkeypatch, tmp_path):
+    from langchain_core.messages import AIMessage
+    from agent.state import add_tool_call_record, create_initial_state, get_state_summary
+    from backend.db import DatabaseManager
+    from backend.models import AutomationRequest
+
+    state = create_initial_state("p1", "Ana", "Lopez", "1995-01-15", use_llm=False)
+    add_tool_call_record(state, "mobile_ui", "click", {}, {"content": "clicked"}, 12, True)
+    state["messages"].append(AIMessage(content="done"))
+
+    class FakeAgent:
+        def run(self, **kwargs):
+            return get_state_summary(state)
+
+    monkeypatch.setattr(main, "acquire_agent", lambda *args: FakeAgent())
+    monkeypatch.setattr(main, "release_agent", lambda agent: None)
+
+    request = AutomationRequest(first_name="Ana", last_name="Lopez", date_of_birth="1995-01-15", use_llm=False)
+    main.register_automation("p1", {
+        "process_id": "p1", "status": "running", "finished": False,
+        "messages": main.deque(), "trace_messages": main.deque(),
+        "history_versions": {"conversation": 0, "tool_calls": 0},
+    })
+    db = DatabaseManager(f"sqlite:///{tmp_path / 'runs.db'}")
+    try:
+        asyncio.run(main.run_automation_workflow("p1", request, db))
+    finally:
+        db.close()
+
+    automation = main.active_automations["p1"]
+    assert automation["finished"]
+    assert [c["tool_name"] for c in automation["tool_calls"]] == ["mobile_ui"]
+    assert automation["successful_tool_calls"] == 1
+    assert [m["content"] for m in automation["trace_messages"]] == ["done"]
+
+
+def test_export_cache_tracks_appends_to_a_full_history():
+    automation = {
+        "process_id": "p1", "tool_calls": main.deque(maxlen=1), "trace_tool_calls": main.deque(maxlen=1),
+        "successful_tool_calls": 0, "failed_tool_calls": 0, "tools_used": set(),
+        "history_versions": {"conversation": 0, "tool_calls": 0},
+    }
+    cache = {}
+
+    def export():
+        return main.encode_export_section(automation["tool_calls"], automation["history_versions"]["tool_calls"],
+                                          cache, "tool_calls")
+
+    main.append_tool_call(automation, {"tool_name": "mobile_ui", "action": "click", "success": True})
+    first = export()
+    assert export() is first
+
+    # Same length as before; only the version shows the history changed
+    main.append_tool_call(automation, {"tool_name": "ocr", "action": "read", "success": True})
+    second = export()
+    assert b'"ocr"' in second and b'"mobile_ui"' not in second
+
+
+@pytest.mark.parametrize("value", [0, 19950115, "1995-01-15T00:00:00", "1995-01-15 ", "95-1-15"])
+def test_automation_request_rejects_non_iso_birth_dates(value):
+    from pydantic import ValidationError
+    from backend.models import AutomationRequest
+
+    with pytest.raises(ValidationError):
+        AutomationRequest(first_name="Ana", last_name="Lopez", date_of_birth=value)
+
+    request = AutomationRequest(first_name="Ana", last_name="Lopez", date_of_birth="1995-01-15")
+    assert request.date_of_birth.isoformat() == "1995-01-15"
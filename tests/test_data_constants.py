@@ -0,0 +1,40 @@
+# test_data_constants.py
+"""Date helpers in data.constants"""
+
+import pytest
+
+from data.constants import _split_date, parse_birth_date, validate_age
+
+
+def test_split_date_parses_valid_dates():
+    assert _split_date("1995-01-15") == (1995, 1, 15)
+    assert _split_date("2024-02-29") == (2024, 2, 29)
+    assert _split_date("2000-02-29") == (2000, 2, 29)
+
+
+@pytest.mark.parametrize("value", [
+    "2023-02-29", "1900-02-29", "2024-04-31", "2024-13-01", "2024-00-10", "2024-01-00",
+    "0000-01-01", "2024/01/01", "2024-1-01", "24-01-01", "", "abcd-ef-gh",
+    "1995- 1-15", "1995-01-1 ", "1_95-01-15", "+995-01-15", "1995-+1-15", "١٩٩٥-01-15",
+])
+def test_split_date_rejects_malformed_or_impossible_dates(value):
+    with pytest.raises(ValueError):
+        _split_date(value)
+
+
+def test_parse_birth_date_uses_full_month_names():
+    assert parse_birth_date("1995-03-07") == {"day": 7, "month": "March", "year": 1995}
+    with pytest.raises(ValueError):
+        parse_birth_date("1995-02-30")
+    with pytest.raises(ValueError):
+        parse_birth_date("+995-01-15")
+
+
+def test_validate_age_counts_birthdays_not_years():
+    from datetime import date
+
+    today = date(2025, 6, 15)
+    assert validate_age("2007-06-15", today=today)
+    assert not validate_age("2007-06-16", today=today)
+    assert not validate_age("2007-02-30", today=today)
+    assert not validate_age("1_95-01-15", today=today)
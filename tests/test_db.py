@@ -0,0 +1,102 @@
+# test_db.py
+"""DatabaseManager process log batching and buffering"""
+
+import pytest
+
+from backend import db as db_module
+from backend.db import DatabaseManager
+
+
+@pytest.fixture
+def db(tmp_path):
+    manager = DatabaseManager(f"sqlite:///{tmp_path / 'automation.db'}")
+    yield manager
+    manager.close()
+
+
+def test_recent_logs_fall_back_to_sqlite_for_processes_not_created_here(db):
+    # An earlier run (another worker, or before a restart) left rows in the database
+    db.add_process_logs([("p1", "init", f"old {i}", "INFO") for i in range(3)])
+
+    db.add_process_log("p1", "new", step="email")
+    assert db.flush()
+
+    messages = [row["message"] for row in db.iter_recent_process_logs("p1", 10)]
+    assert len(messages) == 4
+    assert messages[-1].startswith("old")
+
+
+def test_recent_logs_served_from_memory_for_local_processes(db, monkeypatch):
+    db.begin_process_logs("p2")
+    db.add_process_log("p2", "first")
+    db.add_process_log("p2", "second")
+
+    monkeypatch.setattr(db_module.DatabaseManager, "iter_process_logs",
+                        lambda *args: pytest.fail("local process read hit SQLite"))
+
+    assert [row["message"] for row in db.iter_recent_process_logs("p2", 10)] == ["second", "first"]
+
+
+def test_flusher_writes_queued_logs_in_bounded_batches(db, monkeypatch):
+    batches = []
+    write = DatabaseManager.add_process_logs
+
+    def recording_write(self, rows):
+        batches.append(len(rows))
+        return write(self, rows)
+
+    monkeypatch.setattr(DatabaseManager, "add_process_logs", recording_write)
+
+    total = db_module.LOG_BATCH_SIZE * 2 + 7
+    for i in range(total):
+        db.add_process_log("p3", f"line {i}")
+    assert db.flush()
+
+    assert sum(batches) == total
+    assert max(batches) <= db_module.LOG_BATCH_SIZE
+    assert len(batches) < total
+    assert db.get_process_logs("p3", total + 1)[-1]["message"] == "line 0"
+
+
+def test_add_process_logs_splits_rows_under_the_variable_limit(db, monkeypatch):
+    # Two rows' worth of bound variables per statement
+    monkeypatch.setattr(db_module, "MAX_BOUND_VARIABLES", 2 * len(db_module.PROCESS_LOG_COLUMNS))
+
+    rows = [("p4", None, f"line {i}", "INFO") for i in range(5)]
+    assert db.add_process_logs(rows) == 5
+    assert len(db.get_process_logs("p4", 10)) == 5
+
+
+def test_close_writes_logs_still_queued(tmp_path):
+    url = f"sqlite:///{tmp_path / 'closing.db'}"
+    manager = DatabaseManager(url)
+    for i in range(3):
+        manager.add_process_log("p5", f"line {i}")
+    manager.close()
+
+    reopened = DatabaseManager(url)
+    try:
+        assert [row["message"] for row in reopened.get_process_logs("p5", 10)] == ["line 2", "line 1", "line 0"]
+    finally:
+        reopened.close()
+
+
+def test_process_ids_sort_by_time_and_carry_80_random_bits():
+    first = db_module.generate_process_id("proc")
+    second = db_module.generate_process_id("proc")
+
+    prefix, body = first.split("_")
+    assert prefix == "proc" and len(body) == 12 + 20
+    int(body, 16)
+    assert first[:len("proc_") + 12] <= second[:len("proc_") + 12]
+    assert first != second
+
+
+def test_log_helpers_are_plain_blocking_calls(db):
+    assert db_module.log_tool_call(db, "p3", {"tool_name": "ocr", "action": "read", "success": True})
+    db.add_process_logs([("p3", "init", "started", "INFO")])
+
+    logs = db_module.get_automation_logs(db, "p3")
+
+    assert logs["process_id"] == "p3"
+    assert [row["message"] for row in logs["logs"]] == ["started"]
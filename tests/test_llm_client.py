@@ -0,0 +1,276 @@
+# test_llm_client.py
+"""Response caches, request coalescing, hedging and token budgets in llm.llm_client"""
+
+import asyncio
+
+import pytest
+
+from llm import llm_client as llm_module
+from llm.llm_client import DiskResponseCache, LLMClient, _auto_max_tokens, estimate_tokens
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv("LLM_CACHE_DISK", "0")
+    return LLMClient()
+
+
+def counting_dispatch(client, results, delay=0.01):
+    """Replace _adispatch with a fake provider that answers from `results` in order."""
+    calls = []
+
+    async def fake(prov, prompt, *args):
+        calls.append(prov.value)
+        await asyncio.sleep(delay)
+        res = results[len(calls) - 1]
+        if isinstance(res, BaseException):
+            raise res
+        return res
+
+    client._adispatch = fake
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_calls_share_one_request(client):
+    calls = counting_dispatch(client, [{"success": True, "content": "ok"}])
+
+    results = await asyncio.gather(*(client.agenerate_response("same prompt") for _ in range(3)))
+
+    assert calls == ["groq"]
+    assert [r["content"] for r in results] == ["ok"] * 3
+    # Every caller gets its own dict, none of them the cached one
+    assert len({id(r) for r in results}) == 3
+    results[0]["content"] = "mutated"
+    assert (await client.agenerate_response("same prompt"))["content"] == "ok"
+
+
+@pytest.mark.asyncio
+async def test_leader_failure_reaches_waiters(client):
+    counting_dispatch(client, [RuntimeError("boom")])
+
+    results = await asyncio.gather(*(client.agenerate_response("p") for _ in range(2)), return_exceptions=True)
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert not client._inflight
+
+
+@pytest.mark.asyncio
+async def test_waiter_retries_when_leader_is_cancelled(client):
+    calls = counting_dispatch(client, [{"success": True, "content": "never"}, {"success": True, "content": "retried"}],
+                              delay=0.05)
+
+    leader = asyncio.create_task(client.agenerate_response("p"))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(client.agenerate_response("p"))
+    await asyncio.sleep(0.01)
+    leader.cancel()
+
+    assert (await waiter)["content"] == "retried"
+    assert calls == ["groq", "groq"]
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+
+def test_json_complete_ignores_braces_inside_strings():
+    from llm.llm_client import _json_complete
+
+    assert _json_complete('{"cause": "x", "alternatives": []}')
+    assert _json_complete('  {"a": {"b": 1}}\n')
+    assert not _json_complete('{"solution": "use {placeholder}')
+    assert not _json_complete('{"solution": "close with }')
+    assert not _json_complete('{"a": "\\"}')
+    assert not _json_complete('{"a": {"b": 1}')
+    assert not _json_complete('Here you go: {"a": 1}')
+
+
+@pytest.mark.asyncio
+async def test_hedge_returns_backup_when_primary_is_slow(client):
+    async def fake_call(prov, *args):
+        if prov.value == "gemini":
+            await asyncio.sleep(1)
+            return {"success": True, "content": "primary"}
+        return {"success": True, "content": "backup"}
+
+    client._acall = fake_call
+
+    res = await client.agenerate_with_hedge("p", primary="gemini", backup="groq", hedge_delay=0.01)
+
+    assert res["content"] == "backup"
+
+
+@pytest.mark.asyncio
+async def test_hedge_skips_backup_when_primary_answers_in_time(client):
+    started = []
+
+    async def fake_call(prov, *args):
+        started.append(prov.value)
+        return {"success": True, "content": prov.value}
+
+    client._acall = fake_call
+
+    res = await client.agenerate_with_hedge("p", primary="gemini", backup="groq", hedge_delay=0.5)
+
+    assert res["content"] == "gemini"
+    assert started == ["gemini"]
+
+
+@pytest.mark.asyncio
+async def test_hedge_cancels_both_requests_when_caller_times_out(client):
+    cancelled = []
+
+    async def fake_call(prov, *args):
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(prov.value)
+            raise
+
+    client._acall = fake_call
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(client.agenerate_with_hedge("p", primary="gemini", backup="groq", hedge_delay=0.01), 0.05)
+    await asyncio.sleep(0)
+
+    assert sorted(cancelled) == ["gemini", "groq"]
+
+
+@pytest.mark.asyncio
+async def test_hedge_cancels_backup_when_primary_raises(client):
+    cancelled = []
+
+    async def fake_call(prov, *args):
+        if prov.value == "groq":
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.append(prov.value)
+                raise
+        await asyncio.sleep(0.02)
+        raise RuntimeError("boom")
+
+    client._acall = fake_call
+
+    with pytest.raises(RuntimeError):
+        await client.agenerate_with_hedge("p", primary="gemini", backup="groq", hedge_delay=0.01)
+    await asyncio.sleep(0)
+
+    assert cancelled == ["groq"]
+
+
+def test_disk_cache_is_off_unless_enabled(monkeypatch):
+    monkeypatch.delenv("LLM_CACHE_DISK", raising=False)
+    assert LLMClient()._disk_cache is None
+
+
+def test_disk_cache_round_trip_and_expiry(tmp_path):
+    path = str(tmp_path / "cache" / "responses.db")
+    cache = DiskResponseCache(path)
+    cache.put(b"k1", {"success": True, "response": "hi"})
+
+    assert cache.get(b"k1") == {"success": True, "response": "hi"}
+    assert cache.get(b"missing") is None
+    # A second handle on the same file sees the entry, as a restarted process would
+    assert DiskResponseCache(path).get(b"k1")["response"] == "hi"
+
+    expired = DiskResponseCache(str(tmp_path / "expired.db"), ttl=-1)
+    expired.put(b"k2", {"success": True, "response": "old"})
+    assert expired.get(b"k2") is None
+
+
+def test_disk_cache_replays_answers_across_clients(monkeypatch, tmp_path):
+    monkeypatch.setenv("LLM_CACHE_DISK", "1")
+    monkeypatch.setenv("LLM_CACHE_DIR", str(tmp_path))
+
+    first = LLMClient()
+    calls = []
+    first._dispatch = lambda *args: calls.append(args) or {"success": True, "response": "plan"}
+    assert first.generate_response("same prompt")["response"] == "plan"
+
+    restarted = LLMClient()
+    restarted._dispatch = lambda *args: pytest.fail("disk cache miss")
+    res = restarted.generate_response("same prompt")
+
+    assert res["response"] == "plan"
+    assert res["metadata"]["cache"] == "hit"
+    assert len(calls) == 1
+
+
+def test_auto_max_tokens_shrinks_with_prompt_size():
+    assert _auto_max_tokens("short prompt", None) == llm_module.DEFAULT_MAX_TOKENS
+
+    medium = "word " * 2000
+    used = estimate_tokens(medium) + estimate_tokens("system")
+    expected = llm_module.CONTEXT_TOKEN_BUDGET - used - llm_module.TOKEN_MARGIN
+    assert llm_module.MIN_AUTO_MAX_TOKENS < expected < llm_module.DEFAULT_MAX_TOKENS
+    assert _auto_max_tokens(medium, "system") == expected
+
+    assert _auto_max_tokens("word " * 20000, None) == llm_module.MIN_AUTO_MAX_TOKENS
+
+
+def test_generate_response_sizes_max_tokens_only_when_unset(client):
+    budgets = []
+    client._dispatch = lambda prov, prompt, model, temperature, max_tokens, *rest: (
+        budgets.append(max_tokens) or {"success": True, "response": "ok"}
+    )
+
+    client.generate_response("word " * 2000, temperature=0.5)
+    client.generate_response("word " * 2000, temperature=0.5, max_tokens=100)
+
+    assert budgets == [_auto_max_tokens("word " * 2000, None), 100]
+
+
+def test_async_clients_are_dropped_with_their_loop(monkeypatch, client):
+    import gc
+    from types import SimpleNamespace
+    from backend.enums import LLMProvider
+
+    class FakeAsync:
+        def __init__(self, api_key):
+            pass
+
+    monkeypatch.setattr(llm_module, "load_provider", lambda provider: SimpleNamespace(AsyncOpenAI=FakeAsync))
+
+    async def build():
+        first = client._client(LLMProvider.OPENAI, "AsyncOpenAI")
+        assert client._client(LLMProvider.OPENAI, "AsyncOpenAI") is first
+        return first
+
+    assert asyncio.run(build()) is not asyncio.run(build())
+    gc.collect()
+
+    assert len(client._loop_clients) == 0
+
+
+def test_groq_llm_is_shared_across_max_tokens(monkeypatch, client):
+    from types import SimpleNamespace
+
+    built = []
+
+    class FakeChatGroq:
+        def __init__(self, **kwargs):
+            built.append(kwargs)
+
+        def bind(self, **kwargs):
+            return SimpleNamespace(llm=self, kwargs=kwargs)
+
+    monkeypatch.setattr(llm_module, "load_provider", lambda provider: SimpleNamespace(ChatGroq=FakeChatGroq))
+
+    small = client._groq_llm("m", 0.1, 256)
+    large = client._groq_llm("m", 0.1, 2048, response_format={"type": "json_object"})
+
+    assert len(built) == 1 and "max_tokens" not in built[0]
+    assert small.llm is large.llm
+    assert small.kwargs == {"max_tokens": 256}
+    assert large.kwargs == {"max_tokens": 2048, "response_format": {"type": "json_object"}}
+
+
+def test_anthropic_system_marks_only_cacheable_prefixes():
+    from llm.llm_client import ERROR_ANALYSIS_SYSTEM, _anthropic_system
+
+    short = _anthropic_system(ERROR_ANALYSIS_SYSTEM)
+    assert short == {"system": [{"type": "text", "text": ERROR_ANALYSIS_SYSTEM}]}
+
+    long_system = "word " * (2 * llm_module.ANTHROPIC_CACHE_MIN_TOKENS)
+    assert _anthropic_system(long_system)["system"][0]["cache_control"] == {"type": "ephemeral"}
+    assert _anthropic_system(None) == {}
@@ -0,0 +1,45 @@
+# test_logging_middleware.py
+"""Request logging in backend.logging_middleware"""
+
+import logging
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.logging_middleware import LoggingMiddleware
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def test_middleware_builds_and_redacts_sensitive_fields():
+    handler = RecordingHandler()
+    logger = logging.getLogger("test.middleware")
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+
+    app = FastAPI()
+    app.add_middleware(LoggingMiddleware, logger=logger)
+
+    @app.post("/echo")
+    async def echo(payload: dict):
+        return payload
+
+    response = TestClient(app).post("/echo", json={"first_name": "Ana", "password": "hunter2"},
+                                    headers={"Authorization": "Bearer secret"})
+
+    assert response.status_code == 200
+    assert response.json()["password"] == "hunter2"
+    assert "X-Request-ID" in response.headers
+
+    request_log = next(r for r in handler.records if getattr(r, "type", None) == "request")
+    assert '"password":"***REDACTED***"' in request_log.body
+    assert '"first_name":"Ana"' in request_log.body
+    assert request_log.headers["authorization"] == "***REDACTED***"
+    assert any(getattr(r, "type", None) == "response" and r.status_code == 200 for r in handler.records)
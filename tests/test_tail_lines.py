@@ -0,0 +1,36 @@
+# test_tail_lines.py
+"""Backward file tailing used by /api/v2/system/logs"""
+
+import pytest
+
+from backend.main import tail_lines
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    path = tmp_path / "automation.log"
+    path.write_text("".join(f"line {i}\n" for i in range(1000)))
+    return str(path)
+
+
+@pytest.mark.parametrize("block_size", [7, 64, 8192])
+def test_returns_last_lines_across_block_boundaries(log_file, block_size):
+    assert tail_lines(log_file, 3, block_size=block_size) == ["line 997", "line 998", "line 999"]
+
+
+def test_short_file_returns_every_line(log_file):
+    assert len(tail_lines(log_file, 5000)) == 1000
+
+
+def test_zero_lines_and_missing_final_newline(tmp_path):
+    path = tmp_path / "partial.log"
+    path.write_text("first\nsecond\nthird")
+
+    assert tail_lines(str(path), 0) == []
+    assert tail_lines(str(path), 2, block_size=4) == ["second", "third"]
+
+
+def test_empty_file(tmp_path):
+    path = tmp_path / "empty.log"
+    path.write_text("")
+    assert tail_lines(str(path), 10) == []
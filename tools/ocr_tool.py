@@ -8,12 +8,19 @@ from typing import Type, Optional, Dict, Any, Literal, Tuple, List
 from pydantic import BaseModel, Field
 from langchain.tools import BaseTool
 import time
-import hashlib
+import threading
+from collections import OrderedDict
 from datetime import datetime
 from pydantic import PrivateAttr
 
 from perception.preprocess import create_preprocessor
-from perception.ocr_engines import get_ocr_manager
+from perception.ocr_engines import get_ocr_manager, content_hash
+from backend.settings import ocr_settings
+
+# Process-wide LRU of OCR text per (screenshot, region, config), shared by every OCRTool
+SCREEN_OCR_CACHE: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+# Agents run in worker threads, so every read-and-reorder or insert-and-evict holds this lock
+SCREEN_OCR_CACHE_LOCK = threading.Lock()
 
 class OCRAction(BaseModel):
     """Input schema for OCR tool actions."""
@@ -51,7 +58,7 @@ Available actions:
     _driver: Any = PrivateAttr()
     _preprocessor = PrivateAttr()
     _ocr_manager = PrivateAttr()
-    _screen_cache: Dict[str, Any] = PrivateAttr(default_factory=dict)
+    _screen_cache: Dict[str, Any] = PrivateAttr(default_factory=lambda: SCREEN_OCR_CACHE)
 
 
     def __init__(self, driver):
@@ -120,7 +127,8 @@ Available actions:
 
         elif action == "clear_cache":
             self._ocr_manager.clear_cache()
-            self._screen_cache.clear()
+            with SCREEN_OCR_CACHE_LOCK:
+                self._screen_cache.clear()
             return {"status": "SUCCESS", "message": "OCR caches cleared"}
 
         else:
@@ -137,14 +145,14 @@ Available actions:
         # Generate cache key
         region_str = str(region) if region else "fullscreen"
         config_str = str(preprocess_config) if preprocess_config else "default"
-        cache_key = hashlib.md5(f"{region_str}_{config_str}".encode()).hexdigest()[:16]
+        full_cache_key = f"{content_hash(screenshot_data)}_{region_str}_{config_str}"
 
         # Check cache
-        screenshot_hash = hashlib.md5(screenshot_data).hexdigest()[:16]
-        full_cache_key = f"{screenshot_hash}_{cache_key}"
-
-        if full_cache_key in self._screen_cache:
-            cached_result = self._screen_cache[full_cache_key]
+        with SCREEN_OCR_CACHE_LOCK:
+            cached_result = self._screen_cache.get(full_cache_key)
+            if cached_result is not None:
+                self._screen_cache.move_to_end(full_cache_key)
+        if cached_result is not None:
             print(f"⚡ [OCR] Cache hit for {region_str}")
             return {
                 "status": "SUCCESS",
@@ -176,14 +184,12 @@ Available actions:
             "confidence": ocr_result.confidence,
             "engine": ocr_result.engine
         }
-        self._screen_cache[full_cache_key] = cache_data
-
-        # Clean cache if too large
-        if len(self._screen_cache) > 20:
-            # Remove oldest entries
-            old_keys = list(self._screen_cache.keys())[:5]
-            for key in old_keys:
-                del self._screen_cache[key]
+        with SCREEN_OCR_CACHE_LOCK:
+            self._screen_cache[full_cache_key] = cache_data
+
+            # Evict least recently used entries
+            while len(self._screen_cache) > ocr_settings.max_region_cache:
+                self._screen_cache.popitem(last=False)
 
         result_text = ocr_result.text or "No text found"
         confidence_pct = int(ocr_result.confidence * 100)
@@ -5,6 +5,7 @@ Provides unified interface for tool creation and management
 """
 
 from typing import List, Dict, Any, Optional
+from functools import lru_cache
 from langchain.tools import BaseTool
 
 from tools.mobile_ui_tool import create_mobile_ui_tool
@@ -81,15 +82,10 @@ class ToolRegistry:
                         print(f"   Actions: {', '.join(actions[:5])}")
             print()
 
-# Global registry instance
-_tool_registry = None
-
+@lru_cache(maxsize=1)
 def get_tool_registry() -> ToolRegistry:
     """Get the global tool registry instance."""
-    global _tool_registry
-    if _tool_registry is None:
-        _tool_registry = ToolRegistry()
-    return _tool_registry
+    return ToolRegistry()
 
 def create_tool_list(driver) -> List[BaseTool]:
     """